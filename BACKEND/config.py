@@ -166,6 +166,18 @@ class ProcessingConfig:
     
     # Tumor Board
     TUMOR_BOARD_MAX_AGENTS = int(os.getenv("TUMOR_BOARD_MAX_AGENTS", "2"))
+    # Send radiology/pathology/clinical reports to the LLM as one request
+    BATCH_SPECIALISTS = os.getenv("TUMOR_BOARD_BATCH_SPECIALISTS", "false").lower() == "true"
+    
+    # Tumor Board near-duplicate coordinator cache (off: a hit reuses a prior synthesis)
+    TUMOR_BOARD_SEMANTIC_CACHE = os.getenv("TUMOR_BOARD_SEMANTIC_CACHE", "false").lower() == "true"
+    TUMOR_BOARD_SEMANTIC_THRESHOLD = float(os.getenv("TUMOR_BOARD_SEMANTIC_THRESHOLD", "0.97"))
+    TUMOR_BOARD_SEMANTIC_TTL_SECONDS = int(os.getenv("TUMOR_BOARD_SEMANTIC_TTL_SECONDS", "3600"))
+    
+    # Reuse research recommendations for identical diagnosis/stage/biomarker profiles
+    TUMOR_BOARD_RESEARCH_CACHE = os.getenv("TUMOR_BOARD_RESEARCH_CACHE", "false").lower() == "true"
+    # Bump when the referenced guidelines change; invalidates cached research
+    TUMOR_BOARD_GUIDELINES_VERSION = os.getenv("TUMOR_BOARD_GUIDELINES_VERSION", "2024")
 
 
 # =============================================================================
@@ -4,7 +4,7 @@ Provides a unified interface for LLM calls using Groq API
 """
 import os
 from groq import Groq
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterator, List, Optional
 
 # Initialize Groq client
 _client: Optional[Groq] = None
@@ -67,6 +67,34 @@ def groq_chat(
     }
 
 
+def groq_chat_stream(
+    model: str,
+    messages: List[Dict[str, str]],
+    temperature: float = 0.1,
+    max_tokens: int = 4096
+) -> Iterator[str]:
+    """
+    Stream a Groq chat completion, yielding content deltas as they arrive.
+    
+    JSON mode is not available together with streaming on Groq, so callers
+    must instruct the model to return JSON in the prompt itself.
+    """
+    client = get_groq_client()
+    
+    stream = client.chat.completions.create(
+        model=model,
+        messages=messages,
+        temperature=temperature,
+        max_tokens=max_tokens,
+        stream=True
+    )
+    
+    for chunk in stream:
+        delta = chunk.choices[0].delta.content
+        if delta:
+            yield delta
+
+
 def list_models() -> Dict[str, Any]:
     """List available Groq models (static list since Groq doesn't have a list endpoint)."""
     return {
@@ -21,7 +21,7 @@ from config import LLMModels, LLMConfigs, ProcessingConfig, get_model_name
 
 # Import multi-agent system
 from tumor_board_agents import (
-    TumorBoardRunner,
+    get_runner,
     TumorBoardView,
     RadiologyAgent,
     PathologyAgent,
@@ -773,7 +773,7 @@ async def generate_multi_agent_analysis(patient_data: Dict[str, Any]) -> Dict[st
     
     # Run agents using TumorBoardRunner (local execution - medical reasoning stays here)
     try:
-        runner = TumorBoardRunner()  # Uses config defaults
+        runner = get_runner()  # Shared instance, uses config defaults
         
         # =====================================================================
         # AZURE AI AGENT SERVICE ORCHESTRATION (OPTIONAL)
@@ -945,7 +945,7 @@ async def process_tumor_board_background(case_id: str, patient_id: str, hospital
         await update_progress(case_id, 35, "Running AI analysis on medical data...")
         
         # Run the LLM in a thread pool to not block
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
         tumor_board_view = await loop.run_in_executor(
             None,
             generate_tumor_board_with_llm,
@@ -8,6 +8,7 @@ This module contains specialized AI agents for tumor board analysis:
 - **ClinicalAgent**: Analyzes clinical notes, labs, patient history
 - **ResearchAgent**: Provides evidence-based treatment recommendations
 - **CoordinatorAgent**: Orchestrates all agents and synthesizes final view
+- **MultiReportAgent**: Runs the specialist extractions in one LLM call (optional)
 
 Usage:
     from tumor_board_agents import TumorBoardRunner
@@ -33,9 +34,10 @@ from .pathology import PathologyAgent
 from .clinical import ClinicalAgent
 from .research import ResearchAgent
 from .coordinator import CoordinatorAgent
+from .multi import MultiReportAgent
 
 from .schemas import TumorBoardView, TumorBoardFinding, TumorBoardRecommendation
-from .runner import TumorBoardRunner, run_tumor_board_analysis
+from .runner import TumorBoardRunner, get_runner, run_tumor_board_analysis
 
 __all__ = [
     # Base
@@ -54,11 +56,13 @@ __all__ = [
     'ClinicalAgent',
     'ResearchAgent',
     'CoordinatorAgent',
+    'MultiReportAgent',
     # Schemas
     'TumorBoardView',
     'TumorBoardFinding',
     'TumorBoardRecommendation',
     # Runner
     'TumorBoardRunner',
+    'get_runner',
     'run_tumor_board_analysis'
 ]
@@ -1,5 +1,6 @@
 """Base module exports."""
-from .agent_base import TumorBoardAgentBase, AgentContext
+from .agent_base import TumorBoardAgentBase, AgentContext, SplitPromptTemplate
+from .json_stream import JSONArrayStreamScanner, find_json_span, json_loads, json_dumps_compact
 from .agent_types import (
     AgentType, 
     ConfidenceLevel, 
@@ -7,17 +8,28 @@ from .agent_types import (
     Finding, 
     Recommendation, 
     AgentOutput,
-    TumorBoardCase
+    TumorBoardCase,
+    intern_label,
+    with_case_variants,
+    compact_json_default
 )
 
 __all__ = [
     'TumorBoardAgentBase',
     'AgentContext',
+    'SplitPromptTemplate',
+    'JSONArrayStreamScanner',
+    'find_json_span',
+    'json_loads',
+    'json_dumps_compact',
     'AgentType',
     'ConfidenceLevel',
     'SeverityLevel',
     'Finding',
     'Recommendation',
     'AgentOutput',
-    'TumorBoardCase'
+    'TumorBoardCase',
+    'intern_label',
+    'with_case_variants',
+    'compact_json_default'
 ]
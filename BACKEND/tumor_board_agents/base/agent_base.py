@@ -5,14 +5,16 @@ All specialized agents MUST inherit from TumorBoardAgentBase and implement
 the required abstract methods to ensure consistent behavior across the pipeline.
 """
 
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional
+from typing import Callable, Dict, Any, Iterable, Iterator, List, Optional, Tuple
 from dataclasses import dataclass, asdict
 from datetime import datetime
+from functools import lru_cache
 import json
-from groq_client import groq_chat
+from groq_client import groq_chat, groq_chat_stream
 
-from .agent_types import AgentType, AgentOutput, ConfidenceLevel
+from .agent_types import AgentType, AgentOutput, ConfidenceLevel, Finding
 
 
 @dataclass
@@ -33,6 +35,30 @@ class AgentContext:
             self.additional_context = {}
 
 
+class SplitPromptTemplate:
+    """
+    A prompt template pre-split around its one large substitution.
+    
+    The multi-KB boilerplate on either side is formatted once per distinct
+    set of remaining fields (patient id/name, report type...) and cached, so
+    each call only concatenates the report text between the two halves.
+    """
+    
+    def __init__(self, template: str, field_name: str, maxsize: int = 64):
+        self.field_name = field_name
+        self._head, self._tail = template.split("{" + field_name + "}")
+        self._parts = lru_cache(maxsize=maxsize)(self._format_parts)
+    
+    def _format_parts(self, **fields) -> Tuple[str, str]:
+        return self._head.format(**fields), self._tail.format(**fields)
+    
+    def format(self, **fields) -> str:
+        """Equivalent to template.format(**fields)."""
+        value = fields.pop(self.field_name)
+        head, tail = self._parts(**fields)
+        return f"{head}{value}{tail}"
+
+
 class TumorBoardAgentBase(ABC):
     """
     Base class for all Tumor Board AI agents.
@@ -45,6 +71,14 @@ class TumorBoardAgentBase(ABC):
     5. All agents MUST cite source page/report when making claims
     """
     
+    # Patient-independent instructions sent as a system message ahead of
+    # get_prompt(). Keeping it byte-identical across calls lets the provider
+    # reuse its cached prefill for it.
+    system_prompt: Optional[str] = None
+    
+    # Response budget per LLM call
+    max_tokens: int = 2048
+    
     def __init__(self, model_name: str = "llama-3.1-8b-instant"):
         self.model_name = model_name
         self.agent_type: AgentType = AgentType.UNKNOWN
@@ -78,21 +112,49 @@ class TumorBoardAgentBase(ABC):
         """
         pass
     
-    def analyze(self, context: AgentContext) -> AgentOutput:
+    def parse_response_streaming(
+        self,
+        response_iter: Iterable[str],
+        context: AgentContext,
+        on_finding: Callable[[Finding], None]
+    ) -> AgentOutput:
+        """
+        Parse a streamed LLM response.
+        
+        Agents that can recognise findings before the response is complete
+        override this and pass each one to on_finding as soon as it is
+        parsed. The default simply waits for the whole response.
+        """
+        return self.parse_response("".join(response_iter), context)
+    
+    def analyze(
+        self,
+        context: AgentContext,
+        on_finding: Optional[Callable[[Finding], None]] = None
+    ) -> AgentOutput:
         """
         Main entry point for agent analysis.
         
+        If on_finding is given, the LLM response is streamed and findings
+        are handed to it as they become available (see
+        parse_response_streaming); the complete AgentOutput is still returned.
+        
         DO NOT OVERRIDE unless you have a very good reason.
         """
         try:
             # Build prompt
             prompt = self.get_prompt(context)
             
-            # Call LLM
-            response = self._call_llm(prompt)
-            
-            # Parse response
-            output = self.parse_response(response, context)
+            if on_finding is None:
+                # Call LLM
+                response = self._call_llm(prompt)
+                
+                # Parse response
+                output = self.parse_response(response, context)
+            else:
+                output = self.parse_response_streaming(
+                    self._call_llm_stream(prompt), context, on_finding
+                )
             
             # Add metadata
             output.agent_type = self.agent_type
@@ -116,17 +178,45 @@ class TumorBoardAgentBase(ABC):
                 source_patient_id=context.patient_id
             )
     
+    async def analyze_async(self, context: AgentContext) -> AgentOutput:
+        """
+        Run analyze() without blocking the event loop.
+        
+        The LLM call is blocking I/O, so it is dispatched to the default
+        executor; this lets several agents wait on the LLM concurrently.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.analyze, context)
+    
+    def _build_messages(self, prompt: str) -> List[Dict[str, str]]:
+        """Chat messages for prompt, with the static system prompt first if set."""
+        if self.system_prompt:
+            return [
+                {'role': 'system', 'content': self.system_prompt},
+                {'role': 'user', 'content': prompt}
+            ]
+        return [{'role': 'user', 'content': prompt}]
+    
     def _call_llm(self, prompt: str) -> str:
         """Call the LLM with the given prompt using Groq API."""
         response = groq_chat(
             model=self.model_name,
-            messages=[{'role': 'user', 'content': prompt}],
+            messages=self._build_messages(prompt),
             temperature=0.1,
-            max_tokens=2048,
+            max_tokens=self.max_tokens,
             response_format={"type": "json_object"}
         )
         return response['message']['content']
     
+    def _call_llm_stream(self, prompt: str) -> Iterator[str]:
+        """Call the LLM with streaming, yielding response text chunks."""
+        return groq_chat_stream(
+            model=self.model_name,
+            messages=self._build_messages(prompt),
+            temperature=0.1,
+            max_tokens=self.max_tokens
+        )
+    
     def validate_output(self, output: AgentOutput) -> List[str]:
         """
         Validate the output meets clinical safety requirements.
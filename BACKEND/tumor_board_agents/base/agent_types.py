@@ -2,11 +2,40 @@
 Agent Types, Enums, and Core Schemas for Tumor Board Agents.
 """
 
+import sys
 from enum import Enum
 from dataclasses import dataclass, field
 from typing import List, Dict, Any, Optional
 
 
+# Values dropped from compact (prompt-bound) serializations
+_EMPTY_VALUES = (None, "", [], {})
+
+
+# Labels repeated across every case; parsed copies collapse onto these literals
+_INTERNED_CATEGORIES = {label: label for label in (
+    "diagnosis", "grade", "biomarker", "mutation", "surgical", "tumor",
+    "lymph_nodes", "metastasis", "imaging", "pathology", "clinical",
+    "laboratory", "radiology", "research", "treatment", "biopsy", "referral",
+)}
+
+
+def intern_label(value: Any) -> Any:
+    """Return a shared copy of a short label (category, gene, source) parsed from LLM JSON."""
+    if value.__class__ is str and len(value) <= 32:
+        return _INTERNED_CATEGORIES.get(value) or sys.intern(value)
+    return value
+
+
+def with_case_variants(mapping: Dict[str, Any]) -> Dict[str, Any]:
+    """Extend a lowercase lookup table with UPPER and Title keys, so common
+    LLM spellings resolve with a single dict hit and no .lower() call."""
+    table = dict(mapping)
+    for key, value in mapping.items():
+        table.setdefault(key.upper(), value)
+        table.setdefault(key.title(), value)
+    return table
+
 class AgentType(Enum):
     """Types of specialized agents in the tumor board pipeline."""
     RADIOLOGY = "radiology"
@@ -34,7 +63,7 @@ class SeverityLevel(Enum):
     INFORMATIONAL = "info"   # FYI only
 
 
-@dataclass
+@dataclass(slots=True)
 class Finding:
     """A single clinical finding from an agent."""
     category: str                          # e.g., "tumor_size", "lymph_nodes", "biomarker"
@@ -48,6 +77,36 @@ class Finding:
     interpretation: Optional[str] = None   # Clinical interpretation (optional)
     raw_text: Optional[str] = None         # Original OCR text for verification
     
+    @classmethod
+    def _fast_new(
+        cls,
+        category: str,
+        name: str,
+        value: str,
+        severity: SeverityLevel = SeverityLevel.INFORMATIONAL,
+        confidence: ConfidenceLevel = ConfidenceLevel.MEDIUM,
+        source_report: Optional[str] = None,
+        interpretation: Optional[str] = None,
+        unit: Optional[str] = None
+    ) -> "Finding":
+        """
+        Build a Finding without going through the dataclass __init__.
+        
+        Used by parse_response hot loops; every field is still populated.
+        """
+        obj = object.__new__(cls)
+        obj.category = category
+        obj.name = name
+        obj.value = value
+        obj.unit = unit
+        obj.severity = severity
+        obj.confidence = confidence
+        obj.source_page = None
+        obj.source_report = source_report
+        obj.interpretation = interpretation
+        obj.raw_text = None
+        return obj
+    
     def to_dict(self) -> Dict[str, Any]:
         return {
             "category": self.category,
@@ -63,7 +122,7 @@ class Finding:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class Recommendation:
     """A clinical recommendation from an agent."""
     category: str                          # e.g., "treatment", "imaging", "biopsy"
@@ -73,6 +132,26 @@ class Recommendation:
     evidence_level: Optional[str] = None   # e.g., "Level 1A", "Expert Opinion"
     source: Optional[str] = None           # Citation or source
     
+    @classmethod
+    def _fast_new(
+        cls,
+        category: str,
+        text: str,
+        priority: SeverityLevel = SeverityLevel.MODERATE,
+        rationale: Optional[str] = None,
+        evidence_level: Optional[str] = None,
+        source: Optional[str] = None
+    ) -> "Recommendation":
+        """Build a Recommendation without going through the dataclass __init__."""
+        obj = object.__new__(cls)
+        obj.category = category
+        obj.text = text
+        obj.priority = priority
+        obj.rationale = rationale
+        obj.evidence_level = evidence_level
+        obj.source = source
+        return obj
+    
     def to_dict(self) -> Dict[str, Any]:
         return {
             "category": self.category,
@@ -84,7 +163,7 @@ class Recommendation:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentOutput:
     """Standardized output from any tumor board agent."""
     agent_type: AgentType = AgentType.UNKNOWN
@@ -125,6 +204,38 @@ class AgentOutput:
         }
 
 
+# Fields written by compact_json_default; per-run metadata (timestamp,
+# processing time) is left out so identical content serializes identically
+_COMPACT_FIELDS = {
+    Finding: Finding.__slots__,
+    Recommendation: Recommendation.__slots__,
+    AgentOutput: tuple(
+        name for name in AgentOutput.__slots__
+        if name not in ("timestamp", "processing_time_ms")
+    ),
+}
+
+
+def compact_json_default(obj: Any) -> Any:
+    """
+    json/orjson `default` hook that serializes agent objects straight from
+    their slots, dropping null/empty fields. Used when outputs are embedded
+    in a prompt, where empty fields only cost tokens; saves building a
+    to_dict() tree first.
+    """
+    fields = _COMPACT_FIELDS.get(obj.__class__)
+    if fields is not None:
+        result = {}
+        for name in fields:
+            value = getattr(obj, name)
+            if value not in _EMPTY_VALUES:
+                result[name] = value
+        return result
+    if isinstance(obj, Enum):
+        return obj.value
+    raise TypeError(f"Object of type {obj.__class__.__name__} is not JSON serializable")
+
+
 @dataclass
 class TumorBoardCase:
     """Complete tumor board case with all agent analyses."""
@@ -144,6 +255,36 @@ class TumorBoardCase:
     final_recommendations: List[Recommendation] = field(default_factory=list)
     all_warnings: List[str] = field(default_factory=list)
     
+    @classmethod
+    def _fast_new(
+        cls,
+        patient_id: str,
+        patient_name: Optional[str],
+        case_date: str,
+        radiology_output: Optional[AgentOutput],
+        pathology_output: Optional[AgentOutput],
+        clinical_output: Optional[AgentOutput],
+        research_output: Optional[AgentOutput],
+        coordinator_output: AgentOutput,
+        all_warnings: List[str]
+    ) -> "TumorBoardCase":
+        """Batch-path constructor: fills __dict__ directly, bypassing __init__."""
+        case = object.__new__(cls)
+        case.__dict__.update(
+            patient_id=patient_id,
+            patient_name=patient_name,
+            case_date=case_date,
+            radiology_output=radiology_output,
+            pathology_output=pathology_output,
+            clinical_output=clinical_output,
+            research_output=research_output,
+            coordinator_output=coordinator_output,
+            final_summary=coordinator_output.summary,
+            final_recommendations=coordinator_output.recommendations,
+            all_warnings=all_warnings
+        )
+        return case
+    
     def to_dict(self) -> Dict[str, Any]:
         return {
             "patient_id": self.patient_id,
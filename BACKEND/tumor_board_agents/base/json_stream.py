@@ -0,0 +1,142 @@
+"""
+JSON helpers for LLM responses, including incremental parsing of streams.
+"""
+
+import json
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # Optional speedup; stdlib json is used otherwise
+    orjson = None
+
+
+def json_loads(text: str) -> Any:
+    """json.loads, via orjson when available (raises json.JSONDecodeError either way)."""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def json_dumps_compact(obj: Any, default: Optional[Callable[[Any], Any]] = None) -> str:
+    """
+    Compact (no whitespace, non-ASCII kept) JSON text, via orjson when available.
+    
+    Dataclasses are passed to `default` like any other unknown type, so
+    both backends produce the same output.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=default, option=orjson.OPT_PASSTHROUGH_DATACLASS).decode()
+    return json.dumps(obj, default=default, separators=(",", ":"), ensure_ascii=False)
+
+
+# Only braces, quotes and backslashes affect where a JSON object ends
+_STRUCTURAL_RE = re.compile(r'[{}"\\]')
+
+
+def find_json_span(text: str) -> Optional[Tuple[int, int]]:
+    """
+    Locate the first balanced {...} block in text in a single linear pass.
+    
+    Braces inside string literals (including escaped quotes) are ignored.
+    Returns (start, end) slice bounds, or None if no object is closed.
+    """
+    start = text.find('{')
+    if start < 0:
+        return None
+    
+    depth = 0
+    in_string = False
+    escaped_pos = -1
+    for match in _STRUCTURAL_RE.finditer(text, start):
+        pos = match.start()
+        if pos == escaped_pos:
+            continue
+        ch = match.group()
+        if in_string:
+            if ch == '\\':
+                escaped_pos = pos + 1
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == '{':
+            depth += 1
+        elif ch == '}':
+            depth -= 1
+            if depth == 0:
+                return start, pos + 1
+    return None
+
+
+class JSONArrayStreamScanner:
+    """
+    Picks completed objects out of one top-level array while the response
+    is still streaming in.
+    
+    Feed text chunks as they arrive; each call returns the elements of the
+    array under `key` that were closed by that chunk. The full response text
+    stays available as `text` for the final json.loads.
+    """
+    
+    def __init__(self, key: str):
+        self.key = key
+        self._chunks: List[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._key_chars: Optional[List[str]] = None
+        self._last_key: Optional[str] = None
+        self._array_depth: Optional[int] = None
+        self._item_chars: Optional[List[str]] = None
+    
+    @property
+    def text(self) -> str:
+        return "".join(self._chunks)
+    
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        self._chunks.append(chunk)
+        completed = []
+        
+        for ch in chunk:
+            if self._item_chars is not None:
+                self._item_chars.append(ch)
+            
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == '\\':
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._key_chars is not None:
+                        self._last_key = "".join(self._key_chars)
+                        self._key_chars = None
+                elif self._key_chars is not None:
+                    self._key_chars.append(ch)
+                continue
+            
+            if ch == '"':
+                self._in_string = True
+                # Only strings directly inside the root object can be our key
+                self._key_chars = [] if self._depth == 1 else None
+            elif ch == '{' or ch == '[':
+                self._depth += 1
+                if ch == '[' and self._depth == 2 and self._last_key == self.key:
+                    self._array_depth = self._depth
+                elif (ch == '{' and self._array_depth is not None
+                        and self._depth == self._array_depth + 1 and self._item_chars is None):
+                    self._item_chars = ['{']
+            elif ch == '}' or ch == ']':
+                self._depth -= 1
+                if self._item_chars is not None and self._depth == self._array_depth:
+                    try:
+                        completed.append(json.loads("".join(self._item_chars)))
+                    except json.JSONDecodeError:
+                        pass  # Left for the final full parse to report
+                    self._item_chars = None
+                elif self._array_depth is not None and self._depth < self._array_depth:
+                    self._array_depth = None
+        
+        return completed
@@ -6,21 +6,41 @@ Extracts: Comorbidities, performance status, symptoms, treatment history
 """
 
 import json
-import re
-from typing import List
+from typing import Any, Dict, List
 
 from ..base import (
     TumorBoardAgentBase, 
     AgentContext, 
+    SplitPromptTemplate,
     AgentType,
     AgentOutput, 
     Finding, 
     Recommendation,
     ConfidenceLevel,
-    SeverityLevel
+    SeverityLevel,
+    find_json_span,
+    with_case_variants
 )
 from .prompt import CLINICAL_EXTRACTION_PROMPT
 
+# Boilerplate around the report text is formatted once per patient
+_PROMPT = SplitPromptTemplate(CLINICAL_EXTRACTION_PROMPT, "report_text")
+
+
+# Lookup tables for LLM-provided enum strings (built once, not per finding)
+_SEVERITY_MAP = with_case_variants({
+    "critical": SeverityLevel.CRITICAL,
+    "high": SeverityLevel.HIGH,
+    "moderate": SeverityLevel.MODERATE,
+    "low": SeverityLevel.LOW
+})
+
+_CONFIDENCE_MAP = with_case_variants({
+    "high": ConfidenceLevel.HIGH,
+    "medium": ConfidenceLevel.MEDIUM,
+    "low": ConfidenceLevel.LOW
+})
+
 
 class ClinicalAgent(TumorBoardAgentBase):
     """Specialized agent for analyzing clinical notes and patient history."""
@@ -38,7 +58,7 @@ class ClinicalAgent(TumorBoardAgentBase):
         return "Analyzes clinical notes to extract patient history, comorbidities, performance status, and treatment history"
     
     def get_prompt(self, context: AgentContext) -> str:
-        return CLINICAL_EXTRACTION_PROMPT.format(
+        return _PROMPT.format(
             patient_id=context.patient_id,
             patient_name=context.patient_name or "Unknown",
             patient_age=context.patient_age or "Unknown",
@@ -51,15 +71,19 @@ class ClinicalAgent(TumorBoardAgentBase):
         try:
             data = json.loads(response)
         except json.JSONDecodeError:
-            match = re.search(r'\{.*\}', response, re.DOTALL)
-            if match:
+            span = find_json_span(response)
+            if span:
                 try:
-                    data = json.loads(match.group())
+                    data = json.loads(response[span[0]:span[1]])
                 except:
                     return self._error_output("Failed to parse JSON", context)
             else:
                 return self._error_output("No valid JSON", context)
         
+        return self.parse_data(data, context)
+    
+    def parse_data(self, data: Dict[str, Any], context: AgentContext) -> AgentOutput:
+        """Build the output from an already-decoded response object."""
         findings = []
         recommendations = []
         warnings = data.get("warnings", [])
@@ -76,51 +100,57 @@ class ClinicalAgent(TumorBoardAgentBase):
                 source_report=context.report_type
             ))
         
+        new_finding = Finding._fast_new
+        
         # Comorbidities
         for comorbidity in data.get("comorbidities", []):
-            findings.append(Finding(
+            _get = comorbidity.get
+            findings.append(new_finding(
                 category="comorbidity",
-                name=comorbidity.get("name", "Unknown"),
-                value=comorbidity.get("status", "Present"),
+                name=_get("name", "Unknown"),
+                value=_get("status", "Present"),
                 severity=SeverityLevel.MODERATE,
-                confidence=self._parse_confidence(comorbidity.get("confidence", "medium")),
+                confidence=self._parse_confidence(_get("confidence", "medium")),
                 source_report=context.report_type
             ))
         
         # Symptoms
         for symptom in data.get("symptoms", []):
-            findings.append(Finding(
+            _get = symptom.get
+            findings.append(new_finding(
                 category="symptom",
-                name=symptom.get("name", "Unknown"),
-                value=symptom.get("severity", "Present"),
-                severity=self._parse_severity(symptom.get("severity", "moderate")),
-                confidence=self._parse_confidence(symptom.get("confidence", "medium")),
+                name=_get("name", "Unknown"),
+                value=_get("severity", "Present"),
+                severity=self._parse_severity(_get("severity", "moderate")),
+                confidence=self._parse_confidence(_get("confidence", "medium")),
                 source_report=context.report_type
             ))
         
         # Labs
         for lab in data.get("labs", []):
-            findings.append(Finding(
+            _get = lab.get
+            findings.append(new_finding(
                 category="lab",
-                name=lab.get("name", "Unknown"),
-                value=lab.get("value", "Unknown"),
-                unit=lab.get("unit"),
+                name=_get("name", "Unknown"),
+                value=_get("value", "Unknown"),
+                unit=_get("unit"),
                 severity=SeverityLevel.INFORMATIONAL,
-                confidence=self._parse_confidence(lab.get("confidence", "medium")),
+                confidence=self._parse_confidence(_get("confidence", "medium")),
                 source_report=context.report_type,
-                interpretation=lab.get("interpretation")
+                interpretation=_get("interpretation")
             ))
         
         # Treatment history
         for treatment in data.get("treatment_history", []):
-            findings.append(Finding(
+            _get = treatment.get
+            findings.append(new_finding(
                 category="treatment",
-                name=treatment.get("type", "Treatment"),
-                value=treatment.get("name", "Unknown"),
+                name=_get("type", "Treatment"),
+                value=_get("name", "Unknown"),
                 severity=SeverityLevel.INFORMATIONAL,
-                confidence=self._parse_confidence(treatment.get("confidence", "medium")),
+                confidence=self._parse_confidence(_get("confidence", "medium")),
                 source_report=context.report_type,
-                interpretation=treatment.get("response")
+                interpretation=_get("response")
             ))
         
         for rec in data.get("recommendations", []):
@@ -164,16 +194,22 @@ class ClinicalAgent(TumorBoardAgentBase):
         return SeverityLevel.MODERATE
     
     def _parse_severity(self, s: str) -> SeverityLevel:
-        mapping = {"critical": SeverityLevel.CRITICAL, "high": SeverityLevel.HIGH, 
-                   "moderate": SeverityLevel.MODERATE, "low": SeverityLevel.LOW}
-        return mapping.get(s.lower(), SeverityLevel.MODERATE)
+        # Fast path: LLM output is usually already lowercase
+        return _SEVERITY_MAP.get(s) or _SEVERITY_MAP.get(s.lower(), SeverityLevel.MODERATE)
     
     def _parse_confidence(self, c: str) -> ConfidenceLevel:
-        mapping = {"high": ConfidenceLevel.HIGH, "medium": ConfidenceLevel.MEDIUM, "low": ConfidenceLevel.LOW}
-        return mapping.get(c.lower(), ConfidenceLevel.MEDIUM)
+        return _CONFIDENCE_MAP.get(c) or _CONFIDENCE_MAP.get(c.lower(), ConfidenceLevel.MEDIUM)
     
     def _overall_confidence(self, findings: List[Finding]) -> ConfidenceLevel:
-        if not findings:
+        n = len(findings)
+        if not n:
             return ConfidenceLevel.LOW
-        high_count = sum(1 for f in findings if f.confidence == ConfidenceLevel.HIGH)
-        return ConfidenceLevel.HIGH if high_count >= len(findings) * 0.7 else ConfidenceLevel.MEDIUM
+        high = ConfidenceLevel.HIGH  # local: skips the attribute lookup per finding
+        high_count = 0
+        for f in findings:
+            if f.confidence is high:
+                high_count += 1
+                # Integer form of high_count >= 70% of findings
+                if high_count * 10 >= n * 7:
+                    return high
+        return ConfidenceLevel.MEDIUM
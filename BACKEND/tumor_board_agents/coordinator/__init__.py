@@ -1,4 +1,4 @@
 """Coordinator module exports."""
-from .coordinator_agent import CoordinatorAgent
+from .coordinator_agent import CoordinatorAgent, CoordinatorCache, SemanticCache
 
-__all__ = ['CoordinatorAgent']
+__all__ = ['CoordinatorAgent', 'CoordinatorCache', 'SemanticCache']
@@ -4,24 +4,171 @@ Coordinator Agent - Orchestrates and synthesizes all agent outputs.
 Combines findings from all specialized agents into a unified tumor board view.
 """
 
+import asyncio
+import hashlib
 import json
+import math
 import re
-from datetime import datetime
-from typing import Dict, List, Optional
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from functools import partial
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
 
 from ..base import (
     TumorBoardAgentBase, 
     AgentContext, 
+    SplitPromptTemplate,
+    JSONArrayStreamScanner,
     AgentType,
     AgentOutput, 
     Finding, 
     Recommendation,
     ConfidenceLevel,
     SeverityLevel,
-    TumorBoardCase
+    TumorBoardCase,
+    find_json_span,
+    intern_label,
+    with_case_variants,
+    compact_json_default,
+    json_dumps_compact
 )
 from .prompt import COORDINATOR_PROMPT
 
+# Boilerplate around the report text is formatted once per patient
+_PROMPT = SplitPromptTemplate(COORDINATOR_PROMPT, "agent_outputs")
+
+
+# Specialist outputs accepted by synthesize_case, in prompt order
+_SPECIALIST_KEYS = ("radiology", "pathology", "clinical", "research")
+
+# Lookup tables for LLM-provided enum strings (built once, not per finding)
+_SEVERITY_MAP = with_case_variants({
+    "critical": SeverityLevel.CRITICAL,
+    "high": SeverityLevel.HIGH,
+    "moderate": SeverityLevel.MODERATE,
+    "low": SeverityLevel.LOW
+})
+
+_CONFIDENCE_MAP = with_case_variants({
+    "high": ConfidenceLevel.HIGH,
+    "medium": ConfidenceLevel.MEDIUM,
+    "low": ConfidenceLevel.LOW
+})
+
+
+class CoordinatorCache:
+    """
+    Bounded LRU cache of coordinator outputs keyed by a hash of the
+    agent outputs that were fed into the coordinator prompt.
+    """
+    
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, AgentOutput]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def make_key(model_name: str, patient_id: str, patient_name: Optional[str], agent_json: str) -> str:
+        """Hash of the coordinator inputs; agent_json is the serialized prompt payload."""
+        payload = json.dumps([model_name, patient_id, patient_name]) + agent_json
+        return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+    
+    def get(self, key: str) -> Optional[AgentOutput]:
+        with self._lock:
+            output = self._entries.get(key)
+            if output is not None:
+                self._entries.move_to_end(key)
+            return output
+    
+    def set(self, key: str, output: AgentOutput):
+        with self._lock:
+            self._entries[key] = output
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# Shared across agent instances (a runner is created per request)
+_coordinator_cache = CoordinatorCache()
+
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def _hashed_token_embedding(text: str, dims: int = 512) -> List[float]:
+    """Dependency-free default embedding: unit-length hashed bag of words."""
+    vector = [0.0] * dims
+    for token in _TOKEN_RE.findall(text.lower()):
+        vector[zlib.crc32(token.encode()) % dims] += 1.0
+    norm = math.sqrt(sum(v * v for v in vector))
+    return [v / norm for v in vector] if norm else vector
+
+
+class SemanticCache:
+    """
+    Near-duplicate cache of coordinator outputs, consulted after an exact
+    CoordinatorCache miss (e.g. reprocessing with regenerated IDs).
+    
+    Entries are scoped to one patient and model, expire after ttl_seconds,
+    and only match at cosine similarity >= threshold. Off by default
+    (ProcessingConfig.TUMOR_BOARD_SEMANTIC_CACHE): a stale hit reuses another
+    run's synthesis, so keep the threshold high and the TTL short.
+    
+    embed maps text to a vector; any sentence-embedding model can be plugged
+    in, otherwise a hashed bag-of-words embedding is used.
+    """
+    
+    def __init__(
+        self,
+        threshold: float = 0.97,
+        ttl_seconds: int = 3600,
+        maxsize: int = 256,
+        embed: Optional[Callable[[str], Sequence[float]]] = None
+    ):
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.maxsize = maxsize
+        self.embed = embed or _hashed_token_embedding
+        self._entries: List[Tuple[str, List[float], float, AgentOutput]] = []
+        self._lock = threading.Lock()
+    
+    def encode(self, text: str) -> List[float]:
+        """Unit-normalized embedding, so a dot product is the cosine."""
+        vector = list(self.embed(text))
+        norm = math.sqrt(sum(v * v for v in vector))
+        return [v / norm for v in vector] if norm else vector
+    
+    def get(self, scope: str, vector: List[float]) -> Optional[AgentOutput]:
+        now = time.monotonic()
+        best, best_score = None, self.threshold
+        with self._lock:
+            self._entries = [e for e in self._entries if e[2] > now]
+            for entry_scope, entry_vector, _, output in self._entries:
+                if entry_scope != scope:
+                    continue
+                score = sum(a * b for a, b in zip(vector, entry_vector))
+                if score >= best_score:
+                    best, best_score = output, score
+        return best
+    
+    def set(self, scope: str, vector: List[float], output: AgentOutput):
+        with self._lock:
+            self._entries.append((scope, vector, time.monotonic() + self.ttl_seconds, output))
+            if len(self._entries) > self.maxsize:
+                del self._entries[0]
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
 
 class CoordinatorAgent(TumorBoardAgentBase):
     """
@@ -29,9 +176,16 @@ class CoordinatorAgent(TumorBoardAgentBase):
     into a unified tumor board presentation.
     """
     
-    def __init__(self, model_name: str = "llama3.2"):
+    def __init__(
+        self,
+        model_name: str = "llama3.2",
+        cache: Optional[CoordinatorCache] = None,
+        semantic_cache: Optional[SemanticCache] = None
+    ):
         super().__init__(model_name)
         self.agent_type = AgentType.COORDINATOR
+        self.cache = cache if cache is not None else _coordinator_cache
+        self.semantic_cache = semantic_cache
     
     @property
     def agent_name(self) -> str:
@@ -43,7 +197,7 @@ class CoordinatorAgent(TumorBoardAgentBase):
     
     def get_prompt(self, context: AgentContext) -> str:
         """Build prompt with all agent outputs."""
-        return COORDINATOR_PROMPT.format(
+        return _PROMPT.format(
             patient_id=context.patient_id,
             patient_name=context.patient_name or "Unknown",
             agent_outputs=context.report_text  # Contains JSON of all agent outputs
@@ -53,36 +207,29 @@ class CoordinatorAgent(TumorBoardAgentBase):
         try:
             data = json.loads(response)
         except json.JSONDecodeError:
-            match = re.search(r'\{.*\}', response, re.DOTALL)
-            if match:
+            span = find_json_span(response)
+            if span:
                 try:
-                    data = json.loads(match.group())
+                    data = json.loads(response[span[0]:span[1]])
                 except:
                     return self._error_output("Failed to parse JSON", context)
             else:
                 return self._error_output("No valid JSON", context)
         
         # Extract prioritized findings
-        findings = []
-        for f in data.get("key_findings", []):
-            findings.append(Finding(
-                category=f.get("category", "summary"),
-                name=f.get("name", "Finding"),
-                value=f.get("value", ""),
-                severity=self._parse_severity(f.get("severity", "moderate")),
-                confidence=self._parse_confidence(f.get("confidence", "medium")),
-                source_report=f.get("source_agent")
-            ))
+        findings = [self._parse_finding(f) for f in data.get("key_findings", [])]
         
         # Extract prioritized recommendations
         recommendations = []
+        new_recommendation = Recommendation._fast_new
         for r in data.get("prioritized_recommendations", []):
-            recommendations.append(Recommendation(
-                category=r.get("category", "treatment"),
-                text=r.get("text", ""),
-                priority=self._parse_severity(r.get("priority", "moderate")),
-                rationale=r.get("rationale"),
-                evidence_level=r.get("evidence_level")
+            _get = r.get
+            recommendations.append(new_recommendation(
+                category=intern_label(_get("category", "treatment")),
+                text=_get("text", ""),
+                priority=self._parse_severity(_get("priority", "moderate")),
+                rationale=_get("rationale"),
+                evidence_level=_get("evidence_level")
             ))
         
         return AgentOutput(
@@ -98,6 +245,33 @@ class CoordinatorAgent(TumorBoardAgentBase):
             sub_agent_outputs=context.additional_context or {}
         )
     
+    def parse_response_streaming(
+        self,
+        response_iter: Iterable[str],
+        context: AgentContext,
+        on_finding: Callable[[Finding], None]
+    ) -> AgentOutput:
+        """
+        Emit key findings while the coordinator is still writing the rest of
+        its response (recommendations, conflicts, staging summary).
+        """
+        scanner = JSONArrayStreamScanner("key_findings")
+        for chunk in response_iter:
+            for item in scanner.feed(chunk):
+                on_finding(self._parse_finding(item))
+        return self.parse_response(scanner.text, context)
+    
+    def _parse_finding(self, f: Dict) -> Finding:
+        _get = f.get
+        return Finding._fast_new(
+            category=intern_label(_get("category", "summary")),
+            name=_get("name", "Finding"),
+            value=_get("value", ""),
+            severity=self._parse_severity(_get("severity", "moderate")),
+            confidence=self._parse_confidence(_get("confidence", "medium")),
+            source_report=intern_label(_get("source_agent"))
+        )
+    
     def synthesize_case(
         self,
         patient_id: str,
@@ -105,34 +279,25 @@ class CoordinatorAgent(TumorBoardAgentBase):
         radiology_output: Optional[AgentOutput] = None,
         pathology_output: Optional[AgentOutput] = None,
         clinical_output: Optional[AgentOutput] = None,
-        research_output: Optional[AgentOutput] = None
+        research_output: Optional[AgentOutput] = None,
+        case_date: Optional[str] = None
     ) -> TumorBoardCase:
         """
         Synthesize all agent outputs into a complete tumor board case.
-        """
-        # Prepare context with all agent outputs
-        agent_data = {
-            "radiology": radiology_output.to_dict() if radiology_output else None,
-            "pathology": pathology_output.to_dict() if pathology_output else None,
-            "clinical": clinical_output.to_dict() if clinical_output else None,
-            "research": research_output.to_dict() if research_output else None
-        }
         
-        context = AgentContext(
-            patient_id=patient_id,
-            patient_name=patient_name,
-            report_text=json.dumps(agent_data, indent=2),
-            additional_context=agent_data
+        case_date defaults to now (UTC); batch callers can pass one shared
+        timestamp for every case in a run.
+        """
+        coordinator_output = self._coordinate(
+            patient_id, patient_name,
+            radiology_output, pathology_output, clinical_output, research_output
         )
         
-        # Run coordinator analysis
-        coordinator_output = self.analyze(context)
-        
         # Build case
         case = TumorBoardCase(
             patient_id=patient_id,
             patient_name=patient_name,
-            case_date=datetime.utcnow().isoformat(),
+            case_date=case_date or datetime.now(timezone.utc).isoformat(timespec="seconds"),
             radiology_output=radiology_output,
             pathology_output=pathology_output,
             clinical_output=clinical_output,
@@ -148,12 +313,145 @@ class CoordinatorAgent(TumorBoardAgentBase):
         
         return case
     
+    async def synthesize_case_parallel(
+        self,
+        patient_id: str,
+        patient_name: Optional[str],
+        report_inputs: Dict[str, Tuple[TumorBoardAgentBase, AgentContext]],
+        case_date: Optional[str] = None
+    ) -> TumorBoardCase:
+        """
+        Run the specialist agents concurrently, then synthesize the case.
+        
+        report_inputs maps "radiology", "pathology", "clinical" and/or
+        "research" to an (agent, context) pair. Missing keys are treated as
+        absent reports. Total latency is the slowest specialist plus the
+        coordinator call, rather than the sum of all of them.
+        """
+        keys = [key for key in _SPECIALIST_KEYS if key in report_inputs]
+        results = await asyncio.gather(*(
+            agent.analyze_async(context)
+            for agent, context in (report_inputs[key] for key in keys)
+        ))
+        outputs = dict(zip(keys, results))
+        
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, partial(
+            self.synthesize_case,
+            patient_id,
+            patient_name,
+            radiology_output=outputs.get("radiology"),
+            pathology_output=outputs.get("pathology"),
+            clinical_output=outputs.get("clinical"),
+            research_output=outputs.get("research"),
+            case_date=case_date
+        ))
+    
+    def synthesize_cases_batch(
+        self,
+        cases: List[Tuple[str, Optional[str], Dict[str, Optional[AgentOutput]]]],
+        max_concurrency: int = 8
+    ) -> List[TumorBoardCase]:
+        """
+        Synthesize many cases (backfills, eval runs) with overlapping LLM calls.
+        
+        Each case is (patient_id, patient_name, outputs) where outputs maps
+        "radiology"/"pathology"/"clinical"/"research" to an AgentOutput.
+        Up to max_concurrency coordinator requests are in flight at once;
+        prompt building and response parsing run on the same worker threads.
+        All cases share one case_date. Results are returned in input order.
+        """
+        case_date = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        
+        def run(case: Tuple[str, Optional[str], Dict[str, Any]]) -> TumorBoardCase:
+            patient_id, patient_name, outputs = case
+            radiology_output = outputs.get("radiology")
+            pathology_output = outputs.get("pathology")
+            clinical_output = outputs.get("clinical")
+            research_output = outputs.get("research")
+            coordinator_output = self._coordinate(
+                patient_id, patient_name,
+                radiology_output, pathology_output, clinical_output, research_output
+            )
+            # Inputs come from our own agents, so skip the dataclass __init__
+            return TumorBoardCase._fast_new(
+                patient_id, patient_name, case_date,
+                radiology_output, pathology_output, clinical_output, research_output,
+                coordinator_output,
+                self._collect_warnings(
+                    radiology_output, pathology_output, clinical_output,
+                    research_output, coordinator_output
+                )
+            )
+        
+        with ThreadPoolExecutor(max_workers=max_concurrency) as pool:
+            return list(pool.map(run, cases))
+    
+    def _coordinate(
+        self,
+        patient_id: str,
+        patient_name: Optional[str],
+        radiology_output: Optional[AgentOutput],
+        pathology_output: Optional[AgentOutput],
+        clinical_output: Optional[AgentOutput],
+        research_output: Optional[AgentOutput]
+    ) -> AgentOutput:
+        """Run (or fetch from cache) the coordinator synthesis for one case."""
+        # Only agents that actually reported; absent ones would just add
+        # "null" entries for the LLM to read
+        agent_outputs = {
+            name: output
+            for name, output in zip(_SPECIALIST_KEYS, (
+                radiology_output, pathology_output, clinical_output, research_output
+            ))
+            if output is not None
+        }
+        
+        # Compact JSON straight from the output objects (no to_dict() tree);
+        # the same text is the cache key input and the prompt payload
+        report_text = self._dump_agent_data(agent_outputs)
+        
+        # Identical agent outputs produce the same synthesis; skip the LLM
+        cache_key = self.cache.make_key(self.model_name, patient_id, patient_name, report_text)
+        coordinator_output = self.cache.get(cache_key)
+        if coordinator_output is not None:
+            return coordinator_output
+        
+        semantic_cache = self.semantic_cache
+        if semantic_cache is not None:
+            scope = f"{self.model_name}:{patient_id}"
+            vector = semantic_cache.encode(report_text)
+            coordinator_output = semantic_cache.get(scope, vector)
+            if coordinator_output is not None:
+                return coordinator_output
+        
+        context = AgentContext(
+            patient_id=patient_id,
+            patient_name=patient_name,
+            report_text=report_text,
+            additional_context={"agents": list(agent_outputs)}
+        )
+        
+        # Run coordinator analysis
+        coordinator_output = self.analyze(context)
+        if coordinator_output.success:
+            self.cache.set(cache_key, coordinator_output)
+            if semantic_cache is not None:
+                semantic_cache.set(scope, vector, coordinator_output)
+        
+        return coordinator_output
+    
+    @staticmethod
+    def _dump_agent_data(agent_outputs: Dict[str, AgentOutput]) -> str:
+        return json_dumps_compact(agent_outputs, default=compact_json_default)
+    
     def _collect_warnings(self, *outputs) -> List[str]:
-        warnings = []
-        for output in outputs:
-            if output and output.warnings:
-                warnings.extend(output.warnings)
-        return list(set(warnings))
+        # Order-preserving dedup keeps the result deterministic
+        return list(dict.fromkeys(
+            warning
+            for output in outputs if output and output.warnings
+            for warning in output.warnings
+        ))
     
     def _error_output(self, error: str, context: AgentContext) -> AgentOutput:
         return AgentOutput(
@@ -167,10 +465,8 @@ class CoordinatorAgent(TumorBoardAgentBase):
         )
     
     def _parse_severity(self, s: str) -> SeverityLevel:
-        mapping = {"critical": SeverityLevel.CRITICAL, "high": SeverityLevel.HIGH,
-                   "moderate": SeverityLevel.MODERATE, "low": SeverityLevel.LOW}
-        return mapping.get(s.lower(), SeverityLevel.MODERATE)
+        # Fast path: LLM output is usually already lowercase
+        return _SEVERITY_MAP.get(s) or _SEVERITY_MAP.get(s.lower(), SeverityLevel.MODERATE)
     
     def _parse_confidence(self, c: str) -> ConfidenceLevel:
-        mapping = {"high": ConfidenceLevel.HIGH, "medium": ConfidenceLevel.MEDIUM, "low": ConfidenceLevel.LOW}
-        return mapping.get(c.lower(), ConfidenceLevel.MEDIUM)
+        return _CONFIDENCE_MAP.get(c) or _CONFIDENCE_MAP.get(c.lower(), ConfidenceLevel.MEDIUM)
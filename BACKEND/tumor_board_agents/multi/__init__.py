@@ -0,0 +1,4 @@
+"""Multi-report module exports."""
+from .multi_report_agent import MultiReportAgent
+
+__all__ = ['MultiReportAgent']
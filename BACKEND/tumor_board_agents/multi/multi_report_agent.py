@@ -0,0 +1,144 @@
+"""
+Multi-Report Agent - Runs several specialist extractions in one LLM call.
+
+Analyzes: Radiology, pathology and clinical reports of one patient together
+Outputs: One AgentOutput per report, parsed by the matching specialist agent
+"""
+
+import json
+from typing import Dict, Optional
+
+from ..base import (
+    TumorBoardAgentBase,
+    AgentContext,
+    AgentType,
+    AgentOutput,
+    ConfidenceLevel,
+    find_json_span
+)
+from ..radiology import RadiologyAgent
+from ..pathology import PathologyAgent
+from ..clinical import ClinicalAgent
+from .prompt import MULTI_REPORT_PROMPT, SECTION_TEMPLATE
+
+
+class MultiReportAgent(TumorBoardAgentBase):
+    """
+    Sends the radiology, pathology and clinical extraction tasks of one
+    patient as a single request and splits the answer back per report.
+    
+    Saves a model round-trip (and the repeated patient header) per extra
+    report, which matters most when the LLM server handles requests one
+    at a time. Each section is still parsed by its own specialist agent.
+    """
+    
+    # Room for up to three specialist outputs in one response
+    max_tokens = 6144
+    
+    def __init__(
+        self,
+        model_name: str = "llama3.2",
+        agents: Optional[Dict[str, TumorBoardAgentBase]] = None
+    ):
+        super().__init__(model_name)
+        self.agent_type = AgentType.UNKNOWN
+        self.agents = agents or {
+            "radiology": RadiologyAgent(model_name),
+            "pathology": PathologyAgent(model_name),
+            "clinical": ClinicalAgent(model_name)
+        }
+    
+    @property
+    def agent_name(self) -> str:
+        return "Multi-Report Agent"
+    
+    @property
+    def agent_description(self) -> str:
+        return "Extracts radiology, pathology and clinical findings in a single LLM call"
+    
+    def analyze_reports(self, contexts: Dict[str, AgentContext]) -> Dict[str, AgentOutput]:
+        """
+        Analyze several reports of one patient with a single LLM call.
+        
+        contexts maps "radiology"/"pathology"/"clinical" to that report's
+        context. Returns the specialist outputs under the same keys.
+        """
+        first = next(iter(contexts.values()))
+        combined = self.analyze(AgentContext(
+            patient_id=first.patient_id,
+            patient_name=first.patient_name,
+            patient_age=first.patient_age,
+            patient_gender=first.patient_gender,
+            additional_context={"reports": contexts}
+        ))
+        
+        outputs = {}
+        for key, context in contexts.items():
+            output = combined.sub_agent_outputs.get(key)
+            if output is None:
+                # Whole call failed; report it on every section
+                output = self._section_error(key, combined.error or "Batched analysis failed", context)
+            output.timestamp = combined.timestamp
+            outputs[key] = output
+        return outputs
+    
+    def get_prompt(self, context: AgentContext) -> str:
+        reports = context.additional_context["reports"]
+        sections = "\n".join(
+            SECTION_TEMPLATE.format(
+                section_key=key,
+                section_prompt=self.agents[key].get_prompt(report_context)
+            )
+            for key, report_context in reports.items()
+        )
+        return MULTI_REPORT_PROMPT.format(
+            patient_id=context.patient_id,
+            patient_name=context.patient_name or "Unknown",
+            section_count=len(reports),
+            sections=sections,
+            section_keys=", ".join(f'"{key}"' for key in reports)
+        )
+    
+    def parse_response(self, response: str, context: AgentContext) -> AgentOutput:
+        try:
+            data = json.loads(response)
+        except json.JSONDecodeError:
+            span = find_json_span(response)
+            if span:
+                try:
+                    data = json.loads(response[span[0]:span[1]])
+                except:
+                    return self._error_output("Failed to parse JSON", context)
+            else:
+                return self._error_output("No valid JSON", context)
+        
+        sub_outputs = {}
+        for key, report_context in context.additional_context["reports"].items():
+            section = data.get(key)
+            if isinstance(section, dict):
+                sub_outputs[key] = self.agents[key].parse_data(section, report_context)
+            else:
+                sub_outputs[key] = self._section_error(key, "Section missing from batched response", report_context)
+        
+        return AgentOutput(
+            agent_type=self.agent_type,
+            agent_name=self.agent_name,
+            success=True,
+            confidence=ConfidenceLevel.MEDIUM,
+            sub_agent_outputs=sub_outputs,
+            source_patient_id=context.patient_id
+        )
+    
+    def _section_error(self, key: str, error: str, context: AgentContext) -> AgentOutput:
+        return self.agents[key]._error_output(error, context)
+    
+    def _error_output(self, error: str, context: AgentContext) -> AgentOutput:
+        return AgentOutput(
+            agent_type=self.agent_type,
+            agent_name=self.agent_name,
+            success=False,
+            error=error,
+            confidence=ConfidenceLevel.NONE,
+            warnings=[error],
+            source_patient_id=context.patient_id
+        )
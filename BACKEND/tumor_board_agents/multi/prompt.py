@@ -0,0 +1,31 @@
+"""
+Multi-Report Agent Prompt Template.
+
+Wraps the radiology/pathology/clinical extraction prompts so one model
+request returns all of their outputs.
+"""
+
+MULTI_REPORT_PROMPT = '''You are a TUMOR BOARD EXTRACTION AI handling several reports for one patient at once.
+
+PATIENT: {patient_name} (ID: {patient_id})
+
+Below are {section_count} independent extraction tasks, one per report. Each task
+has its own rules, JSON schema and report text. Apply each task's rules ONLY to
+its own report - do not carry findings from one report into another section.
+
+{sections}
+
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+RESPONSE FORMAT
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+Return ONE JSON object with exactly these top-level keys: {section_keys}
+Each key holds the JSON object that the matching task asks for.
+
+Return ONLY the JSON object, no explanations.
+'''
+
+SECTION_TEMPLATE = '''══════════ TASK: {section_key} ══════════
+
+{section_prompt}
+'''
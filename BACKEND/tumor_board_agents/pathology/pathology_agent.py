@@ -6,21 +6,35 @@ Extracts: Tumor grade, stage, biomarkers (ER, PR, HER2, Ki-67), mutations
 """
 
 import json
-import re
 from typing import Dict, Any, List
 
 from ..base import (
     TumorBoardAgentBase, 
     AgentContext, 
+    SplitPromptTemplate,
     AgentType,
     AgentOutput, 
     Finding, 
     Recommendation,
     ConfidenceLevel,
-    SeverityLevel
+    SeverityLevel,
+    find_json_span,
+    intern_label,
+    with_case_variants
 )
 from .prompt import PATHOLOGY_EXTRACTION_PROMPT
 
+# Boilerplate around the report text is formatted once per patient
+_PROMPT = SplitPromptTemplate(PATHOLOGY_EXTRACTION_PROMPT, "report_text")
+
+
+# Lookup table for LLM-provided confidence strings (built once, not per finding)
+_CONFIDENCE_MAP = with_case_variants({
+    "high": ConfidenceLevel.HIGH,
+    "medium": ConfidenceLevel.MEDIUM,
+    "low": ConfidenceLevel.LOW
+})
+
 
 class PathologyAgent(TumorBoardAgentBase):
     """
@@ -47,7 +61,7 @@ class PathologyAgent(TumorBoardAgentBase):
         return "Analyzes pathology reports to extract histology, biomarkers, grading, and molecular findings"
     
     def get_prompt(self, context: AgentContext) -> str:
-        return PATHOLOGY_EXTRACTION_PROMPT.format(
+        return _PROMPT.format(
             patient_id=context.patient_id,
             patient_name=context.patient_name or "Unknown",
             report_text=context.report_text,
@@ -58,15 +72,19 @@ class PathologyAgent(TumorBoardAgentBase):
         try:
             data = json.loads(response)
         except json.JSONDecodeError:
-            match = re.search(r'\{.*\}', response, re.DOTALL)
-            if match:
+            span = find_json_span(response)
+            if span:
                 try:
-                    data = json.loads(match.group())
+                    data = json.loads(response[span[0]:span[1]])
                 except:
                     return self._error_output("Failed to parse JSON response", context)
             else:
                 return self._error_output("No valid JSON in response", context)
         
+        return self.parse_data(data, context)
+    
+    def parse_data(self, data: Dict[str, Any], context: AgentContext) -> AgentOutput:
+        """Build the output from an already-decoded response object."""
         findings = []
         recommendations = []
         warnings = data.get("warnings", [])
@@ -96,29 +114,33 @@ class PathologyAgent(TumorBoardAgentBase):
                 source_report=context.report_type
             ))
         
+        new_finding = Finding._fast_new
+        
         # Parse biomarkers
         for marker in data.get("biomarkers", []):
-            severity = SeverityLevel.HIGH if marker.get("value", "").lower() == "positive" else SeverityLevel.MODERATE
-            findings.append(Finding(
+            _get = marker.get
+            severity = SeverityLevel.HIGH if _get("value", "").lower() == "positive" else SeverityLevel.MODERATE
+            findings.append(new_finding(
                 category="biomarker",
-                name=marker.get("name", "Unknown Biomarker"),
-                value=marker.get("value", "Unknown"),
+                name=intern_label(_get("name", "Unknown Biomarker")),
+                value=_get("value", "Unknown"),
                 severity=severity,
-                confidence=self._parse_confidence(marker.get("confidence", "medium")),
+                confidence=self._parse_confidence(_get("confidence", "medium")),
                 source_report=context.report_type,
-                interpretation=marker.get("interpretation")
+                interpretation=_get("interpretation")
             ))
         
         # Parse mutations
         for mutation in data.get("mutations", []):
-            findings.append(Finding(
+            _get = mutation.get
+            findings.append(new_finding(
                 category="mutation",
-                name=mutation.get("gene", "Unknown Gene"),
-                value=mutation.get("status", "Unknown"),
+                name=intern_label(_get("gene", "Unknown Gene")),
+                value=_get("status", "Unknown"),
                 severity=SeverityLevel.HIGH,
-                confidence=self._parse_confidence(mutation.get("confidence", "medium")),
+                confidence=self._parse_confidence(_get("confidence", "medium")),
                 source_report=context.report_type,
-                interpretation=mutation.get("clinical_significance")
+                interpretation=_get("clinical_significance")
             ))
         
         # Parse margins
@@ -135,7 +157,7 @@ class PathologyAgent(TumorBoardAgentBase):
         
         # Parse recommendations
         for rec in data.get("recommendations", []):
-            recommendations.append(Recommendation(
+            recommendations.append(Recommendation._fast_new(
                 category="pathology",
                 text=rec.get("text", rec) if isinstance(rec, dict) else str(rec),
                 priority=SeverityLevel.MODERATE
@@ -165,13 +187,19 @@ class PathologyAgent(TumorBoardAgentBase):
         )
     
     def _parse_confidence(self, conf_str: str) -> ConfidenceLevel:
-        mapping = {"high": ConfidenceLevel.HIGH, "medium": ConfidenceLevel.MEDIUM, "low": ConfidenceLevel.LOW}
-        return mapping.get(conf_str.lower(), ConfidenceLevel.MEDIUM)
+        # Fast path: LLM output is usually already lowercase
+        return _CONFIDENCE_MAP.get(conf_str) or _CONFIDENCE_MAP.get(conf_str.lower(), ConfidenceLevel.MEDIUM)
     
     def _overall_confidence(self, findings: List[Finding]) -> ConfidenceLevel:
-        if not findings:
+        n = len(findings)
+        if not n:
             return ConfidenceLevel.LOW
-        high_count = sum(1 for f in findings if f.confidence == ConfidenceLevel.HIGH)
-        if high_count >= len(findings) * 0.7:
-            return ConfidenceLevel.HIGH
+        high = ConfidenceLevel.HIGH  # local: skips the attribute lookup per finding
+        high_count = 0
+        for f in findings:
+            if f.confidence is high:
+                high_count += 1
+                # Integer form of high_count >= 70% of findings
+                if high_count * 10 >= n * 7:
+                    return high
         return ConfidenceLevel.MEDIUM
@@ -6,21 +6,43 @@ Extracts: Tumor size, location, staging, metastasis, lymph nodes
 """
 
 import json
-import re
 from typing import Dict, Any, List
 
 from ..base import (
     TumorBoardAgentBase, 
     AgentContext, 
+    SplitPromptTemplate,
     AgentType,
     AgentOutput, 
     Finding, 
     Recommendation,
     ConfidenceLevel,
-    SeverityLevel
+    SeverityLevel,
+    find_json_span,
+    with_case_variants
 )
 from .prompt import RADIOLOGY_EXTRACTION_PROMPT
 
+# Boilerplate around the report text is formatted once per patient
+_PROMPT = SplitPromptTemplate(RADIOLOGY_EXTRACTION_PROMPT, "report_text")
+
+
+# Lookup tables for LLM-provided enum strings (built once, not per finding)
+_SEVERITY_MAP = with_case_variants({
+    "critical": SeverityLevel.CRITICAL,
+    "high": SeverityLevel.HIGH,
+    "moderate": SeverityLevel.MODERATE,
+    "low": SeverityLevel.LOW,
+    "info": SeverityLevel.INFORMATIONAL
+})
+
+_CONFIDENCE_MAP = with_case_variants({
+    "high": ConfidenceLevel.HIGH,
+    "medium": ConfidenceLevel.MEDIUM,
+    "low": ConfidenceLevel.LOW,
+    "none": ConfidenceLevel.NONE
+})
+
 
 class RadiologyAgent(TumorBoardAgentBase):
     """
@@ -48,7 +70,7 @@ class RadiologyAgent(TumorBoardAgentBase):
     
     def get_prompt(self, context: AgentContext) -> str:
         """Build radiology-specific extraction prompt."""
-        return RADIOLOGY_EXTRACTION_PROMPT.format(
+        return _PROMPT.format(
             patient_id=context.patient_id,
             patient_name=context.patient_name or "Unknown",
             report_text=context.report_text,
@@ -61,59 +83,68 @@ class RadiologyAgent(TumorBoardAgentBase):
             data = json.loads(response)
         except json.JSONDecodeError:
             # Try to extract JSON from response
-            match = re.search(r'\{.*\}', response, re.DOTALL)
-            if match:
+            span = find_json_span(response)
+            if span:
                 try:
-                    data = json.loads(match.group())
+                    data = json.loads(response[span[0]:span[1]])
                 except:
                     return self._error_output("Failed to parse JSON response", context)
             else:
                 return self._error_output("No valid JSON in response", context)
         
+        return self.parse_data(data, context)
+    
+    def parse_data(self, data: Dict[str, Any], context: AgentContext) -> AgentOutput:
+        """Build the output from an already-decoded response object."""
         findings = []
         recommendations = []
         warnings = data.get("warnings", [])
         
+        new_finding = Finding._fast_new
+        
         # Parse tumor findings
         for tumor in data.get("tumors", []):
-            findings.append(Finding(
+            _get = tumor.get
+            findings.append(new_finding(
                 category="tumor",
-                name=tumor.get("location", "Primary Tumor"),
-                value=tumor.get("size", "Unknown"),
-                unit=tumor.get("size_unit", "cm"),
-                severity=self._parse_severity(tumor.get("severity", "moderate")),
-                confidence=self._parse_confidence(tumor.get("confidence", "medium")),
+                name=_get("location", "Primary Tumor"),
+                value=_get("size", "Unknown"),
+                unit=_get("size_unit", "cm"),
+                severity=self._parse_severity(_get("severity", "moderate")),
+                confidence=self._parse_confidence(_get("confidence", "medium")),
                 source_report=context.report_type,
-                interpretation=tumor.get("description")
+                interpretation=_get("description")
             ))
         
         # Parse lymph node findings
         for ln in data.get("lymph_nodes", []):
-            findings.append(Finding(
+            _get = ln.get
+            findings.append(new_finding(
                 category="lymph_nodes",
-                name=ln.get("location", "Lymph Nodes"),
-                value=ln.get("status", "Unknown"),
-                severity=self._parse_severity(ln.get("severity", "moderate")),
-                confidence=self._parse_confidence(ln.get("confidence", "medium")),
+                name=_get("location", "Lymph Nodes"),
+                value=_get("status", "Unknown"),
+                severity=self._parse_severity(_get("severity", "moderate")),
+                confidence=self._parse_confidence(_get("confidence", "medium")),
                 source_report=context.report_type,
-                interpretation=ln.get("description")
+                interpretation=_get("description")
             ))
         
         # Parse metastasis findings
         for met in data.get("metastases", []):
-            findings.append(Finding(
+            _get = met.get
+            findings.append(new_finding(
                 category="metastasis",
-                name=met.get("location", "Metastatic Site"),
-                value=met.get("status", "Present"),
+                name=_get("location", "Metastatic Site"),
+                value=_get("status", "Present"),
                 severity=SeverityLevel.HIGH,
-                confidence=self._parse_confidence(met.get("confidence", "medium")),
+                confidence=self._parse_confidence(_get("confidence", "medium")),
                 source_report=context.report_type,
-                interpretation=met.get("description")
+                interpretation=_get("description")
             ))
         
         # Parse recommendations
         for rec in data.get("recommendations", []):
-            recommendations.append(Recommendation(
+            recommendations.append(Recommendation._fast_new(
                 category="imaging",
                 text=rec.get("text", rec) if isinstance(rec, dict) else str(rec),
                 priority=SeverityLevel.MODERATE,
@@ -146,31 +177,27 @@ class RadiologyAgent(TumorBoardAgentBase):
         )
     
     def _parse_severity(self, severity_str: str) -> SeverityLevel:
-        mapping = {
-            "critical": SeverityLevel.CRITICAL,
-            "high": SeverityLevel.HIGH,
-            "moderate": SeverityLevel.MODERATE,
-            "low": SeverityLevel.LOW,
-            "info": SeverityLevel.INFORMATIONAL
-        }
-        return mapping.get(severity_str.lower(), SeverityLevel.MODERATE)
+        # Fast path: LLM output is usually already lowercase
+        return _SEVERITY_MAP.get(severity_str) or _SEVERITY_MAP.get(severity_str.lower(), SeverityLevel.MODERATE)
     
     def _parse_confidence(self, conf_str: str) -> ConfidenceLevel:
-        mapping = {
-            "high": ConfidenceLevel.HIGH,
-            "medium": ConfidenceLevel.MEDIUM,
-            "low": ConfidenceLevel.LOW,
-            "none": ConfidenceLevel.NONE
-        }
-        return mapping.get(conf_str.lower(), ConfidenceLevel.MEDIUM)
+        return _CONFIDENCE_MAP.get(conf_str) or _CONFIDENCE_MAP.get(conf_str.lower(), ConfidenceLevel.MEDIUM)
     
     def _overall_confidence(self, findings: List[Finding]) -> ConfidenceLevel:
-        if not findings:
+        n = len(findings)
+        if not n:
             return ConfidenceLevel.LOW
         
-        high_count = sum(1 for f in findings if f.confidence == ConfidenceLevel.HIGH)
-        if high_count >= len(findings) * 0.7:
-            return ConfidenceLevel.HIGH
-        elif high_count >= len(findings) * 0.3:
+        high = ConfidenceLevel.HIGH  # local: skips the attribute lookup per finding
+        high_count = 0
+        for f in findings:
+            if f.confidence is high:
+                high_count += 1
+                # Integer form of high_count >= 70% of findings
+                if high_count * 10 >= n * 7:
+                    return high
+        
+        # Integer form of high_count >= 30% of findings
+        if high_count * 10 >= n * 3:
             return ConfidenceLevel.MEDIUM
         return ConfidenceLevel.LOW
@@ -1,4 +1,4 @@
 """Research module exports."""
-from .research_agent import ResearchAgent
+from .research_agent import ResearchAgent, ResearchCache
 
-__all__ = ['ResearchAgent']
+__all__ = ['ResearchAgent', 'ResearchCache']
@@ -6,8 +6,10 @@ Outputs: Evidence-based recommendations with citations
 """
 
 import json
-import re
-from typing import List
+import threading
+from collections import OrderedDict
+from dataclasses import replace
+from typing import Callable, List, Optional, Tuple
 
 from ..base import (
     TumorBoardAgentBase, 
@@ -17,17 +19,124 @@ from ..base import (
     Finding, 
     Recommendation,
     ConfidenceLevel,
-    SeverityLevel
+    SeverityLevel,
+    find_json_span,
+    compact_json_default,
+    json_loads,
+    json_dumps_compact,
+    with_case_variants
 )
-from .prompt import RESEARCH_PROMPT
+from ..utils.validation import detect_disease_category
+from .prompt import RESEARCH_PROMPT_STATIC, RESEARCH_PROMPT_DYNAMIC
+
+
+# Lookup table for LLM-provided priority strings (built once, not per recommendation)
+_PRIORITY_MAP = with_case_variants({
+    "high": SeverityLevel.HIGH,
+    "urgent": SeverityLevel.HIGH,
+    "moderate": SeverityLevel.MODERATE,
+    "low": SeverityLevel.LOW,
+    "routine": SeverityLevel.LOW
+})
+
+
+# Finding names that carry staging information
+_STAGE_TERMS = ("stage", "tnm")
+
+
+class ResearchCache:
+    """
+    Bounded LRU cache of research outputs keyed by the structured evidence
+    the recommendations depend on: diagnosis (and its disease category),
+    grade, stage, biomarkers/mutations, performance status and age, plus
+    the guideline version and model.
+    
+    Off by default (ProcessingConfig.TUMOR_BOARD_RESEARCH_CACHE). Cases
+    without a pathology diagnosis are never cached, and bumping the
+    guideline version invalidates every entry.
+    """
+    
+    def __init__(self, guidelines_version: str, maxsize: int = 1024):
+        self.guidelines_version = guidelines_version
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Tuple, AgentOutput]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def make_key(self, model_name: str, context: AgentContext) -> Optional[Tuple]:
+        """Evidence key for a research context, or None if it should not be cached."""
+        outputs = context.additional_context or {}
+        pathology = outputs.get("pathology")
+        if not (pathology and pathology.success):
+            return None
+        
+        diagnosis = grade = None
+        markers = []
+        for f in pathology.findings:
+            category = f.category
+            if category == "diagnosis":
+                diagnosis = str(f.value).strip().lower()
+            elif category == "grade":
+                grade = str(f.value).strip().lower()
+            elif category == "biomarker" or category == "mutation":
+                markers.append((category, str(f.name).upper(), str(f.value).strip().lower()))
+        
+        if not diagnosis or diagnosis == "unknown":
+            return None
+        
+        stages = []
+        performance = None
+        for output in outputs.values():
+            if not (output and output.success):
+                continue
+            for f in output.findings:
+                name = str(f.name).lower()
+                if any(term in name for term in _STAGE_TERMS):
+                    stages.append(str(f.value).strip().lower())
+                elif f.category == "performance_status":
+                    performance = str(f.value)
+        
+        return (
+            self.guidelines_version,
+            model_name,
+            diagnosis,
+            detect_disease_category({}, diagnosis),
+            grade,
+            tuple(sorted(stages)),
+            frozenset(markers),
+            performance,
+            context.patient_age
+        )
+    
+    def get(self, key: Tuple) -> Optional[AgentOutput]:
+        with self._lock:
+            output = self._entries.get(key)
+            if output is not None:
+                self._entries.move_to_end(key)
+            return output
+    
+    def set(self, key: Tuple, output: AgentOutput):
+        with self._lock:
+            self._entries[key] = output
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
 
 
 class ResearchAgent(TumorBoardAgentBase):
     """Agent that synthesizes treatment recommendations based on clinical evidence."""
     
-    def __init__(self, model_name: str = "llama3.2"):
+    # Rules and schema go out as the shared system message; get_prompt()
+    # only renders the per-patient part
+    system_prompt = RESEARCH_PROMPT_STATIC
+    
+    def __init__(self, model_name: str = "llama3.2", cache: Optional[ResearchCache] = None):
         super().__init__(model_name)
         self.agent_type = AgentType.RESEARCH
+        self.cache = cache
     
     @property
     def agent_name(self) -> str:
@@ -37,49 +146,92 @@ class ResearchAgent(TumorBoardAgentBase):
     def agent_description(self) -> str:
         return "Provides evidence-based treatment recommendations from guidelines and clinical trials"
     
+    def analyze(
+        self,
+        context: AgentContext,
+        on_finding: Optional[Callable[[Finding], None]] = None
+    ) -> AgentOutput:
+        """
+        analyze(), answered from the research cache when one is configured
+        and a case with the same evidence profile was already researched.
+        """
+        cache = self.cache
+        key = cache.make_key(self.model_name, context) if cache is not None else None
+        
+        if key is not None:
+            cached = cache.get(key)
+            if cached is not None:
+                return replace(
+                    cached,
+                    source_patient_id=context.patient_id,
+                    warnings=cached.warnings + [
+                        "Recommendations reused from a prior case with the same diagnosis, stage and biomarkers"
+                    ]
+                )
+        
+        output = super().analyze(context, on_finding)
+        if key is not None and output.success:
+            cache.set(key, output)
+        return output
+    
     def get_prompt(self, context: AgentContext) -> str:
-        return RESEARCH_PROMPT.format(
+        return RESEARCH_PROMPT_DYNAMIC.format(
             patient_id=context.patient_id,
             patient_name=context.patient_name or "Unknown",
             patient_age=context.patient_age or "Unknown",
             clinical_summary=context.report_text,
-            additional_context=json.dumps(context.additional_context or {})
+            # May hold AgentOutput objects; they are written straight from
+            # their slots without a to_dict() pass
+            additional_context=json_dumps_compact(
+                context.additional_context or {}, default=compact_json_default
+            )
         )
     
     def parse_response(self, response: str, context: AgentContext) -> AgentOutput:
         try:
-            data = json.loads(response)
+            data = json_loads(response)
         except json.JSONDecodeError:
-            match = re.search(r'\{.*\}', response, re.DOTALL)
-            if match:
+            # Usual case: one object wrapped in prose, sliced out without a scan
+            start, end = response.find('{'), response.rfind('}')
+            if start < 0 or end < start:
+                return self._error_output("No valid JSON", context)
+            try:
+                data = json_loads(response[start:end + 1])
+            except json.JSONDecodeError:
+                # Trailing braces after the object; take the first balanced one
+                span = find_json_span(response)
+                if span is None:
+                    return self._error_output("Failed to parse JSON", context)
                 try:
-                    data = json.loads(match.group())
-                except:
+                    data = json_loads(response[span[0]:span[1]])
+                except json.JSONDecodeError:
                     return self._error_output("Failed to parse JSON", context)
-            else:
-                return self._error_output("No valid JSON", context)
         
         recommendations = []
         warnings = data.get("warnings", [])
         
+        new_recommendation = Recommendation._fast_new
+        
         for rec in data.get("treatment_options", []):
-            recommendations.append(Recommendation(
+            _get = rec.get
+            recommendations.append(new_recommendation(
                 category="treatment",
-                text=rec.get("name", "Unknown"),
-                priority=self._parse_priority(rec.get("priority", "moderate")),
-                rationale=rec.get("rationale"),
-                evidence_level=rec.get("evidence_level"),
-                source=rec.get("source")
+                text=_get("name", "Unknown"),
+                priority=self._parse_priority(_get("priority", "moderate")),
+                rationale=_get("rationale"),
+                evidence_level=_get("evidence_level"),
+                source=_get("source")
             ))
         
         for rec in data.get("clinical_trials", []):
-            recommendations.append(Recommendation(
+            _get = rec.get
+            recommendations.append(new_recommendation(
                 category="clinical_trial",
-                text=rec.get("name", "Clinical Trial"),
+                text=_get("name", "Clinical Trial"),
                 priority=SeverityLevel.MODERATE,
-                rationale=rec.get("eligibility"),
+                rationale=_get("eligibility"),
                 evidence_level="Clinical Trial",
-                source=rec.get("nct_id")
+                source=_get("nct_id")
             ))
         
         for rec in data.get("additional_recommendations", []):
@@ -113,5 +265,8 @@ class ResearchAgent(TumorBoardAgentBase):
         )
     
     def _parse_priority(self, p: str) -> SeverityLevel:
-        mapping = {"high": SeverityLevel.HIGH, "moderate": SeverityLevel.MODERATE, "low": SeverityLevel.LOW}
-        return mapping.get(p.lower(), SeverityLevel.MODERATE)
+        if isinstance(p, SeverityLevel):
+            return p
+        if not p:
+            return SeverityLevel.MODERATE
+        return _PRIORITY_MAP.get(p) or _PRIORITY_MAP.get(p.lower(), SeverityLevel.MODERATE)
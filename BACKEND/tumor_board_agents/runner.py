@@ -5,26 +5,115 @@ This is the main entry point for running tumor board analysis.
 """
 
 import asyncio
+import heapq
+import io
 import time
+from datetime import datetime, timezone
 from typing import List, Dict, Any, Optional
-from dataclasses import asdict
-from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import compress
 
-# Import config
+# Import config. config.py sits beside the package; put its directory on
+# sys.path only if nothing (e.g. main.py) has imported it already.
 import sys
-import os
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if "config" not in sys.modules:
+    import os
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config import LLMModels, ProcessingConfig
 
-from .base import AgentContext, AgentOutput, TumorBoardCase
+from .base import AgentContext, AgentOutput, Finding, TumorBoardCase
 from .radiology import RadiologyAgent
 from .pathology import PathologyAgent
 from .clinical import ClinicalAgent
-from .research import ResearchAgent
-from .coordinator import CoordinatorAgent
+from .research import ResearchAgent, ResearchCache
+from .coordinator import CoordinatorAgent, SemanticCache
+from .multi import MultiReportAgent
 from .schemas import TumorBoardView, TumorBoardFinding, TumorBoardRecommendation
 
 
+# Report-type keywords per agent, checked in order (first match wins)
+_REPORT_ROUTES = (
+    ("radiology", ("radiology", "imaging", "ct", "mri")),
+    ("pathology", ("pathology", "biopsy", "histology")),
+    ("clinical", ("clinical", "notes", "progress")),
+)
+
+
+def _enum_str(value: Any) -> str:
+    """Enum value, or str() for anything else (e.g. already-plain strings)."""
+    enum_value = getattr(value, 'value', None)
+    return enum_value if enum_value is not None else str(value)
+
+
+# Rank used to pick the findings worth passing on to the research agent
+_SEVERITY_RANK = {"critical": 4, "high": 3, "moderate": 2, "low": 1, "info": 0}
+
+
+def _top_findings(findings: List[Finding], k: int = 5) -> List[Finding]:
+    """The k most severe findings (all of them, in order, if there are no more than k)."""
+    if len(findings) <= k:
+        return findings
+    return heapq.nlargest(k, findings, key=lambda f: _SEVERITY_RANK.get(_enum_str(f.severity), 0))
+
+
+def _view_findings(findings: List[Finding], source_agent: str) -> List[TumorBoardFinding]:
+    """UI findings for one specialist's findings."""
+    return [
+        TumorBoardFinding(
+            category=f.category,
+            title=f.name,
+            value=f.value,
+            severity=_enum_str(f.severity),
+            source_agent=source_agent,
+            interpretation=f.interpretation
+        )
+        for f in findings
+    ]
+
+
+def _route_report(report_type: str) -> Optional[str]:
+    """Agent key for a lowercased report type, or None if no agent handles it."""
+    for key, keywords in _REPORT_ROUTES:
+        if any(keyword in report_type for keyword in keywords):
+            return key
+    return None
+
+
+# Opt-in near-duplicate coordinator cache, shared by all runners
+_semantic_cache = SemanticCache(
+    threshold=ProcessingConfig.TUMOR_BOARD_SEMANTIC_THRESHOLD,
+    ttl_seconds=ProcessingConfig.TUMOR_BOARD_SEMANTIC_TTL_SECONDS
+) if ProcessingConfig.TUMOR_BOARD_SEMANTIC_CACHE else None
+
+# Opt-in research cache keyed by evidence profile, shared by all runners
+_research_cache = ResearchCache(
+    ProcessingConfig.TUMOR_BOARD_GUIDELINES_VERSION
+) if ProcessingConfig.TUMOR_BOARD_RESEARCH_CACHE else None
+
+
+@lru_cache(maxsize=4)
+def _agents_for(model_name: str) -> tuple:
+    """
+    Agent instances for a model, built once per process. Agents keep no
+    per-case state, so concurrent runners can share them.
+    """
+    radiology = RadiologyAgent(model_name)
+    pathology = PathologyAgent(model_name)
+    clinical = ClinicalAgent(model_name)
+    return (
+        radiology,
+        pathology,
+        clinical,
+        ResearchAgent(model_name, cache=_research_cache),
+        CoordinatorAgent(model_name, semantic_cache=_semantic_cache),
+        MultiReportAgent(model_name, agents={
+            "radiology": radiology,
+            "pathology": pathology,
+            "clinical": clinical
+        })
+    )
+
+
 class TumorBoardRunner:
     """
     Orchestrates all tumor board agents for complete case analysis.
@@ -41,16 +130,19 @@ class TumorBoardRunner:
         self.model_name = model_name or LLMModels.TUMOR_BOARD_AGENTS
         self.max_concurrent = max_concurrent or ProcessingConfig.TUMOR_BOARD_MAX_AGENTS
         
-        # Initialize agents
-        self.radiology_agent = RadiologyAgent(self.model_name)
-        self.pathology_agent = PathologyAgent(self.model_name)
-        self.clinical_agent = ClinicalAgent(self.model_name)
-        self.research_agent = ResearchAgent(self.model_name)
-        self.coordinator_agent = CoordinatorAgent(self.model_name)
+        # Agents are shared by every runner on the same model
+        (
+            self.radiology_agent,
+            self.pathology_agent,
+            self.clinical_agent,
+            self.research_agent,
+            self.coordinator_agent,
+            self.multi_report_agent
+        ) = _agents_for(self.model_name)
         
-        # Semaphore for limiting concurrent LLM calls
+        # Semaphore for limiting concurrent LLM calls; the blocking calls run
+        # on asyncio's default executor, shared by every runner
         self._semaphore = asyncio.Semaphore(self.max_concurrent)
-        self._executor = ThreadPoolExecutor(max_workers=4)
     
     async def run(
         self,
@@ -81,111 +173,99 @@ class TumorBoardRunner:
         """
         start_time = time.perf_counter()
         
-        # Prepare contexts from direct text or reports
-        radiology_ctx = pathology_ctx = clinical_ctx = None
-        
-        if radiology_text:
-            radiology_ctx = AgentContext(
-                patient_id=patient_id,
-                patient_name=patient_name,
-                patient_age=patient_age,
-                patient_gender=patient_gender,
-                report_text=radiology_text,
-                report_type="Radiology Report"
-            )
-        
-        if pathology_text:
-            pathology_ctx = AgentContext(
-                patient_id=patient_id,
-                patient_name=patient_name,
-                patient_age=patient_age,
-                patient_gender=patient_gender,
-                report_text=pathology_text,
-                report_type="Pathology Report"
-            )
+        # Patient fields shared by every context
+        base_kwargs = dict(
+            patient_id=patient_id,
+            patient_name=patient_name,
+            patient_age=patient_age,
+            patient_gender=patient_gender
+        )
         
-        if clinical_text:
-            clinical_ctx = AgentContext(
-                patient_id=patient_id,
-                patient_name=patient_name,
-                patient_age=patient_age,
-                patient_gender=patient_gender,
-                report_text=clinical_text,
-                report_type="Clinical Notes"
-            )
+        # Prepare contexts from direct text or reports
+        contexts = {}
+        for key, text, report_type in (
+            ("radiology", radiology_text, "Radiology Report"),
+            ("pathology", pathology_text, "Pathology Report"),
+            ("clinical", clinical_text, "Clinical Notes")
+        ):
+            if text:
+                contexts[key] = AgentContext(**base_kwargs, report_text=text, report_type=report_type)
         
         # Process reports list if provided
         if reports:
             for report in reports:
-                report_type = report.get("type", "").lower()
-                report_text = report.get("text", "")
-                
-                if "radiology" in report_type or "imaging" in report_type or "ct" in report_type or "mri" in report_type:
-                    radiology_ctx = AgentContext(
-                        patient_id=patient_id,
-                        patient_name=patient_name,
-                        patient_age=patient_age,
-                        report_text=report_text,
-                        report_type=report.get("type")
-                    )
-                elif "pathology" in report_type or "biopsy" in report_type or "histology" in report_type:
-                    pathology_ctx = AgentContext(
-                        patient_id=patient_id,
-                        patient_name=patient_name,
-                        patient_age=patient_age,
-                        report_text=report_text,
-                        report_type=report.get("type")
-                    )
-                elif "clinical" in report_type or "notes" in report_type or "progress" in report_type:
-                    clinical_ctx = AgentContext(
-                        patient_id=patient_id,
-                        patient_name=patient_name,
-                        patient_age=patient_age,
-                        patient_gender=patient_gender,
-                        report_text=report_text,
+                key = _route_report(report.get("type", "").lower())
+                if key:
+                    contexts[key] = AgentContext(
+                        **base_kwargs,
+                        report_text=report.get("text", ""),
                         report_type=report.get("type")
                     )
         
-        # Run specialized agents in parallel (with semaphore control)
-        loop = asyncio.get_event_loop()
+        # Nothing to analyze: skip the LLM pipeline entirely
+        if not contexts:
+            return self._empty_view(
+                patient_id, patient_name, patient_age, patient_gender,
+                time.perf_counter() - start_time
+            )
+        
+        radiology_ctx = contexts.get("radiology")
+        pathology_ctx = contexts.get("pathology")
+        clinical_ctx = contexts.get("clinical")
         
+        # Run specialized agents in parallel (with semaphore control)
         async def run_agent_with_semaphore(agent, context):
             if context is None:
                 return None
             async with self._semaphore:
-                return await loop.run_in_executor(
-                    self._executor,
-                    agent.analyze,
-                    context
-                )
+                return await asyncio.to_thread(agent.analyze, context)
         
-        radiology_output, pathology_output, clinical_output = await asyncio.gather(
-            run_agent_with_semaphore(self.radiology_agent, radiology_ctx),
-            run_agent_with_semaphore(self.pathology_agent, pathology_ctx),
-            run_agent_with_semaphore(self.clinical_agent, clinical_ctx)
-        )
+        if ProcessingConfig.BATCH_SPECIALISTS and len(contexts) >= 2:
+            # One request for all reports: one round-trip instead of several
+            async with self._semaphore:
+                outputs = await asyncio.to_thread(
+                    self.multi_report_agent.analyze_reports, contexts
+                )
+            radiology_output = outputs.get("radiology")
+            pathology_output = outputs.get("pathology")
+            clinical_output = outputs.get("clinical")
+        else:
+            radiology_output, pathology_output, clinical_output = await asyncio.gather(
+                run_agent_with_semaphore(self.radiology_agent, radiology_ctx),
+                run_agent_with_semaphore(self.pathology_agent, pathology_ctx),
+                run_agent_with_semaphore(self.clinical_agent, clinical_ctx)
+            )
         
-        # Run research agent with combined context
-        combined_summary = self._build_combined_summary(
-            radiology_output, pathology_output, clinical_output
-        )
+        # Run research agent with combined context; it needs at least one
+        # successful specialist to reason from
+        research_ctx = None
+        if any(output and output.success for output in (radiology_output, pathology_output, clinical_output)):
+            combined_summary = self._build_combined_summary(
+                radiology_output, pathology_output, clinical_output
+            )
+            
+            research_ctx = AgentContext(
+                **base_kwargs,
+                report_text=combined_summary,
+                # Serialized by the research agent directly from the objects
+                additional_context={
+                    "radiology": radiology_output,
+                    "pathology": pathology_output,
+                    "clinical": clinical_output
+                }
+            )
         
-        research_ctx = AgentContext(
-            patient_id=patient_id,
-            patient_name=patient_name,
-            patient_age=patient_age,
-            report_text=combined_summary,
-            additional_context={
-                "radiology": radiology_output.to_dict() if radiology_output else None,
-                "pathology": pathology_output.to_dict() if pathology_output else None,
-                "clinical": clinical_output.to_dict() if clinical_output else None
-            }
-        )
+        # The coordinator needs the research output, so those two LLM calls
+        # stay sequential; the specialist part of the view is built meanwhile
+        sections_task = asyncio.create_task(asyncio.to_thread(
+            self._specialist_sections, radiology_output, pathology_output, clinical_output
+        ))
         
         research_output = await run_agent_with_semaphore(self.research_agent, research_ctx)
         
-        # Run coordinator to synthesize
-        case = self.coordinator_agent.synthesize_case(
+        # Run coordinator to synthesize (off the event loop: it calls the LLM)
+        case = await asyncio.to_thread(
+            self.coordinator_agent.synthesize_case,
             patient_id=patient_id,
             patient_name=patient_name,
             radiology_output=radiology_output,
@@ -196,10 +276,33 @@ class TumorBoardRunner:
         
         # Convert to UI view
         elapsed = time.perf_counter() - start_time
-        view = self._case_to_view(case, patient_age, patient_gender, elapsed)
+        view = self._case_to_view(
+            case, patient_age, patient_gender, elapsed, sections=await sections_task
+        )
         
         return view
     
+    def _empty_view(
+        self,
+        patient_id: str,
+        patient_name: Optional[str],
+        patient_age: Optional[str],
+        patient_gender: Optional[str],
+        elapsed: float
+    ) -> TumorBoardView:
+        """View returned when no report was supplied."""
+        return TumorBoardView(
+            patient_id=patient_id,
+            patient_name=patient_name or "Unknown",
+            patient_age=patient_age,
+            patient_gender=patient_gender,
+            case_date=datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            executive_summary="No reports were provided, so no analysis was run.",
+            warnings=["No radiology, pathology or clinical report provided"],
+            overall_confidence="low",
+            processing_time_seconds=round(elapsed, 2)
+        )
+    
     def _build_combined_summary(
         self,
         radiology: Optional[AgentOutput],
@@ -207,33 +310,76 @@ class TumorBoardRunner:
         clinical: Optional[AgentOutput]
     ) -> str:
         """Build a combined summary for the research agent."""
-        parts = []
+        buf = io.StringIO()
+        write = buf.write
+        
+        for label, output in (("IMAGING", radiology), ("PATHOLOGY", pathology), ("CLINICAL", clinical)):
+            if output and output.success:
+                if buf.tell():
+                    write("\n")
+                write(label)
+                write(": ")
+                write(output.summary)
+                for f in _top_findings(output.findings):
+                    write("\n  - ")
+                    write(f.name)
+                    write(": ")
+                    write(str(f.value))
         
+        return buf.getvalue()
+    
+    def _specialist_sections(
+        self,
+        radiology: Optional[AgentOutput],
+        pathology: Optional[AgentOutput],
+        clinical: Optional[AgentOutput]
+    ) -> Dict[str, List]:
+        """
+        View sections that depend only on the specialist outputs, so they can
+        be built while the research and coordinator calls are in flight.
+        """
+        agents_used = []
+        sections = {"agents_used": agents_used}
+        
+        # Extract imaging findings
         if radiology and radiology.success:
-            parts.append(f"IMAGING: {radiology.summary}")
-            for f in radiology.findings[:5]:
-                parts.append(f"  - {f.name}: {f.value}")
+            agents_used.append("Radiology Agent")
+            sections["imaging_findings"] = _view_findings(radiology.findings, "radiology")
         
+        # Extract pathology findings, split into biomarkers and the rest
         if pathology and pathology.success:
-            parts.append(f"PATHOLOGY: {pathology.summary}")
-            for f in pathology.findings[:5]:
-                parts.append(f"  - {f.name}: {f.value}")
+            agents_used.append("Pathology Agent")
+            view_findings = _view_findings(pathology.findings, "pathology")
+            is_biomarker = [f.category == "biomarker" for f in view_findings]
+            sections["biomarker_findings"] = list(compress(view_findings, is_biomarker))
+            sections["pathology_findings"] = list(compress(view_findings, [not b for b in is_biomarker]))
         
+        # Extract clinical findings
         if clinical and clinical.success:
-            parts.append(f"CLINICAL: {clinical.summary}")
-            for f in clinical.findings[:5]:
-                parts.append(f"  - {f.name}: {f.value}")
+            agents_used.append("Clinical Agent")
+            sections["clinical_findings"] = _view_findings(clinical.findings, "clinical")
         
-        return "\n".join(parts)
+        return sections
     
     def _case_to_view(
         self, 
         case: TumorBoardCase, 
         patient_age: Optional[str],
         patient_gender: Optional[str],
-        elapsed: float
+        elapsed: float,
+        sections: Optional[Dict[str, List]] = None
     ) -> TumorBoardView:
-        """Convert TumorBoardCase to TumorBoardView for UI."""
+        """
+        Convert TumorBoardCase to TumorBoardView for UI.
+        
+        sections is the result of _specialist_sections() when it was
+        already built; otherwise it is built here.
+        """
+        if sections is None:
+            sections = self._specialist_sections(
+                case.radiology_output, case.pathology_output, case.clinical_output
+            )
+        
         view = TumorBoardView(
             patient_id=case.patient_id,
             patient_name=case.patient_name or "Unknown",
@@ -243,91 +389,54 @@ class TumorBoardRunner:
             executive_summary=case.coordinator_output.summary if case.coordinator_output else "",
             warnings=case.all_warnings,
             processing_time_seconds=round(elapsed, 2),
-            agents_used=[]
+            **sections
         )
         
-        # Extract imaging findings
-        if case.radiology_output and case.radiology_output.success:
-            view.agents_used.append("Radiology Agent")
-            for f in case.radiology_output.findings:
-                view.imaging_findings.append(TumorBoardFinding(
-                    category=f.category,
-                    title=f.name,
-                    value=f.value,
-                    severity=f.severity.value if hasattr(f.severity, 'value') else str(f.severity),
-                    source_agent="radiology",
-                    interpretation=f.interpretation
-                ))
-        
-        # Extract pathology findings
-        if case.pathology_output and case.pathology_output.success:
-            view.agents_used.append("Pathology Agent")
-            for f in case.pathology_output.findings:
-                if f.category == "biomarker":
-                    view.biomarker_findings.append(TumorBoardFinding(
-                        category=f.category,
-                        title=f.name,
-                        value=f.value,
-                        severity=f.severity.value if hasattr(f.severity, 'value') else str(f.severity),
-                        source_agent="pathology",
-                        interpretation=f.interpretation
-                    ))
-                else:
-                    view.pathology_findings.append(TumorBoardFinding(
-                        category=f.category,
-                        title=f.name,
-                        value=f.value,
-                        severity=f.severity.value if hasattr(f.severity, 'value') else str(f.severity),
-                        source_agent="pathology",
-                        interpretation=f.interpretation
-                    ))
-        
-        # Extract clinical findings
-        if case.clinical_output and case.clinical_output.success:
-            view.agents_used.append("Clinical Agent")
-            for f in case.clinical_output.findings:
-                view.clinical_findings.append(TumorBoardFinding(
-                    category=f.category,
-                    title=f.name,
-                    value=f.value,
-                    severity=f.severity.value if hasattr(f.severity, 'value') else str(f.severity),
-                    source_agent="clinical",
-                    interpretation=f.interpretation
-                ))
-        
         # Extract recommendations
         if case.research_output and case.research_output.success:
             view.agents_used.append("Research Agent")
-            for r in case.research_output.recommendations:
-                if r.category == "treatment":
-                    view.treatment_recommendations.append(TumorBoardRecommendation(
-                        category=r.category,
-                        text=r.text,
-                        priority=r.priority.value if hasattr(r.priority, 'value') else str(r.priority),
-                        rationale=r.rationale,
-                        evidence_level=r.evidence_level
-                    ))
-                elif r.category == "clinical_trial":
-                    view.clinical_trials.append({
-                        "name": r.text,
-                        "source": r.source or "",
-                        "eligibility": r.rationale or ""
-                    })
-                else:
-                    view.other_recommendations.append(TumorBoardRecommendation(
-                        category=r.category,
-                        text=r.text,
-                        priority=r.priority.value if hasattr(r.priority, 'value') else str(r.priority),
-                        rationale=r.rationale
-                    ))
+            recommendations = case.research_output.recommendations
+            view.treatment_recommendations = [
+                TumorBoardRecommendation(
+                    category=r.category,
+                    text=r.text,
+                    priority=_enum_str(r.priority),
+                    rationale=r.rationale,
+                    evidence_level=r.evidence_level
+                )
+                for r in recommendations if r.category == "treatment"
+            ]
+            view.clinical_trials = [
+                {
+                    "name": r.text,
+                    "source": r.source or "",
+                    "eligibility": r.rationale or ""
+                }
+                for r in recommendations if r.category == "clinical_trial"
+            ]
+            view.other_recommendations = [
+                TumorBoardRecommendation(
+                    category=r.category,
+                    text=r.text,
+                    priority=_enum_str(r.priority),
+                    rationale=r.rationale
+                )
+                for r in recommendations if r.category not in ("treatment", "clinical_trial")
+            ]
         
         if case.coordinator_output:
             view.agents_used.append("Coordinator Agent")
-            view.overall_confidence = case.coordinator_output.confidence.value if hasattr(case.coordinator_output.confidence, 'value') else str(case.coordinator_output.confidence)
+            view.overall_confidence = _enum_str(case.coordinator_output.confidence)
         
         return view
 
 
+@lru_cache(maxsize=None)
+def get_runner(model_name: Optional[str] = None) -> TumorBoardRunner:
+    """Shared runner per model, so agents and the semaphore are not rebuilt per request."""
+    return TumorBoardRunner(model_name=model_name)
+
+
 # Convenience function
 async def run_tumor_board_analysis(
     patient_id: str,
@@ -342,7 +451,7 @@ async def run_tumor_board_analysis(
     
     Returns TumorBoardView ready for UI display.
     """
-    runner = TumorBoardRunner(model_name=model_name)
+    runner = get_runner(model_name)
     return await runner.run(
         patient_id=patient_id,
         patient_name=patient_name,
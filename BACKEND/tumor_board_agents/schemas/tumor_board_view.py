@@ -5,12 +5,20 @@ This schema represents the complete tumor board analysis
 that gets displayed to doctors and exported to PDF.
 """
 
+import json
 from dataclasses import dataclass, field
-from typing import List, Dict, Any, Optional
-from datetime import datetime
+from typing import ClassVar, List, Dict, Any, Optional
+from datetime import datetime, timezone
 
+try:
+    import orjson
+except ImportError:  # Optional speedup; stdlib json is used otherwise
+    orjson = None
 
-@dataclass
+_UTC = timezone.utc
+
+
+@dataclass(slots=True)
 class TumorBoardFinding:
     """A finding displayed in the tumor board UI."""
     category: str
@@ -33,7 +41,7 @@ class TumorBoardFinding:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class TumorBoardRecommendation:
     """A recommendation displayed in the tumor board UI."""
     category: str  # treatment, imaging, biopsy, referral, follow_up
@@ -52,7 +60,7 @@ class TumorBoardRecommendation:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class TumorBoardView:
     """
     Complete tumor board view for UI rendering.
@@ -106,9 +114,15 @@ class TumorBoardView:
     processing_time_seconds: float = 0.0
     agents_used: List[str] = field(default_factory=list)
     
+    # Batch callers can set one timestamp for every view they build
+    default_generated_at: ClassVar[Optional[str]] = None
+    
     def __post_init__(self):
         if not self.generated_at:
-            self.generated_at = datetime.utcnow().isoformat()
+            self.generated_at = (
+                TumorBoardView.default_generated_at
+                or datetime.now(_UTC).isoformat(timespec="seconds")
+            )
     
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -145,5 +159,6 @@ class TumorBoardView:
         }
     
     def to_json(self) -> str:
-        import json
+        if orjson is not None:
+            return orjson.dumps(self.to_dict(), option=orjson.OPT_INDENT_2).decode()
         return json.dumps(self.to_dict(), indent=2)
@@ -12,6 +12,7 @@ from .validation import (
     ValidationResult,
     DiagnosticStatus,
     validate_for_treatment_recommendations,
+    validate_batch,
     is_diagnosis_confirmed,
     has_imaging_data,
     has_pathology_confirmation,
@@ -41,6 +42,7 @@ __all__ = [
     'ValidationResult',
     'DiagnosticStatus',
     'validate_for_treatment_recommendations',
+    'validate_batch',
     'is_diagnosis_confirmed',
     'has_imaging_data',
     'has_pathology_confirmation',
@@ -4,10 +4,29 @@ Confidence Calculator - Evidence-Based Confidence Scoring
 Calculates confidence based on available evidence rather than LLM self-assessment.
 """
 
-from typing import Dict, Any, List, Optional
+import re
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
 
+from .validation import finding_title_lower, finding_value_lower
+
+
+# Finding values that carry no information (compared lowercased). Each
+# factor has its own list, so the sets are deliberately not merged.
+_INVALID_DIAGNOSIS_VALUES = frozenset({"unknown", "pending", "string", "n/a", ""})
+_INVALID_STAGE_VALUES = frozenset({"unknown", "pending", ""})
+_INVALID_BIOMARKER_VALUES = frozenset({"string", "unknown", "n/a", "null", "none", ""})
+_INVALID_LAB_VALUES = frozenset({"none", "n/a", "null", ""})
+
+# Diagnosis terms: a specific cancer type earns full credit, a descriptive
+# one partial credit. Each tuple is searched as one compiled alternation.
+_STRONG_DX = ("carcinoma", "adenocarcinoma", "lymphoma", "leukemia", "sarcoma")
+_WEAK_DX = ("malignant", "neoplasm", "tumor")
+_STRONG_DX_RE = re.compile('|'.join(map(re.escape, _STRONG_DX)))
+_WEAK_DX_RE = re.compile('|'.join(map(re.escape, _WEAK_DX)))
+
 
 class ConfidenceLevel(Enum):
     """Confidence levels with clinical meaning."""
@@ -26,6 +45,20 @@ class ConfidenceAssessment:
     justification: str
 
 
+@dataclass(frozen=True)
+class EvidenceStats:
+    """Counts gathered from the findings in one pass, scored by the _assess_* helpers."""
+    diagnosis_score: float = 0.0
+    imaging_count: int = 0
+    stage_findings: int = 0
+    valid_biomarkers: int = 0
+    lab_count: int = 0
+    valid_labs: int = 0
+    has_tnm_stage: bool = False
+    has_clinical_stage: bool = False
+    has_pathological_stage: bool = False
+
+
 def calculate_evidence_based_confidence(
     findings: Dict[str, Any],
     staging: Optional[Dict[str, Any]] = None,
@@ -36,85 +69,145 @@ def calculate_evidence_based_confidence(
     
     This replaces LLM self-reported confidence with evidence-based scoring.
     """
-    factors = {}
+    level, score, factors, justification = _score_evidence(
+        _collect_evidence_stats(findings, staging)
+    )
+    return ConfidenceAssessment(
+        level=level,
+        score=score,
+        factors=dict(factors),
+        justification=justification
+    )
+
+
+@lru_cache(maxsize=1024)
+def _score_evidence(stats: EvidenceStats) -> Tuple[ConfidenceLevel, float, Tuple[Tuple[str, float], ...], str]:
+    """
+    Score a case from its evidence counts. Pure in its (hashable) input, so
+    cases with the same evidence profile reuse the result; factors come
+    back as a tuple so callers each get their own dict.
+    """
+    # Factors are kept in integer hundredths: the total is then an exact
+    # integer sum, so the level thresholds see the same value as the
+    # reported score (float sums could land at e.g. 0.49999999999999994)
+    points = {}
     
     # Factor 1: Diagnosis Quality (30%)
-    diagnosis_score = _assess_diagnosis_quality(findings)
-    factors["diagnosis"] = round(diagnosis_score * 0.30, 2)
+    diagnosis_score = _assess_diagnosis_quality(stats)
+    points["diagnosis"] = round(diagnosis_score * 0.30 * 100)
     
     # Factor 2: Imaging Coverage (20%)
-    imaging_score = _assess_imaging_coverage(findings)
-    factors["imaging"] = round(imaging_score * 0.20, 2)
+    imaging_score = _assess_imaging_coverage(stats)
+    points["imaging"] = round(imaging_score * 0.20 * 100)
     
     # Factor 3: Staging Completeness (20%)
-    staging_score = _assess_staging_completeness(findings, staging)
-    factors["staging"] = round(staging_score * 0.20, 2)
+    staging_score = _assess_staging_completeness(stats)
+    points["staging"] = round(staging_score * 0.20 * 100)
     
     # Factor 4: Biomarker Relevance (15%)
-    biomarker_score = _assess_biomarker_quality(findings)
-    factors["biomarkers"] = round(biomarker_score * 0.15, 2)
+    biomarker_score = _assess_biomarker_quality(stats)
+    points["biomarkers"] = round(biomarker_score * 0.15 * 100)
     
     # Factor 5: Lab Completeness (15%)
-    lab_score = _assess_lab_completeness(findings)
-    factors["labs"] = round(lab_score * 0.15, 2)
+    lab_score = _assess_lab_completeness(stats)
+    points["labs"] = round(lab_score * 0.15 * 100)
     
     # Calculate total
-    total_score = sum(factors.values())
+    total_points = sum(points.values())
     
     # Determine level
-    if total_score < 0.30:
+    if total_points < 30:
         level = ConfidenceLevel.VERY_LOW
-    elif total_score < 0.50:
+    elif total_points < 50:
         level = ConfidenceLevel.LOW
-    elif total_score < 0.70:
+    elif total_points < 70:
         level = ConfidenceLevel.MODERATE
     else:
         level = ConfidenceLevel.HIGH
     
+    factors = {name: value / 100 for name, value in points.items()}
+    
     # Generate justification
     justification = _generate_justification(factors, level)
     
-    return ConfidenceAssessment(
-        level=level,
-        score=round(total_score, 2),
-        factors=factors,
-        justification=justification
-    )
+    return level, total_points / 100, tuple(factors.items()), justification
 
 
-def _assess_diagnosis_quality(findings: Dict[str, Any]) -> float:
-    """Score diagnosis quality from 0-1."""
-    pathology = findings.get("pathology", [])
+def _has_stage_value(finding: Dict[str, Any]) -> bool:
+    """True for a staging finding (by title) with a usable value."""
+    title = finding_title_lower(finding)
+    if "stage" in title or "tnm" in title:
+        value = finding.get("value", "")
+        return bool(value) and value.lower() not in _INVALID_STAGE_VALUES
+    return False
+
+
+def _collect_evidence_stats(
+    findings: Dict[str, Any],
+    staging: Optional[Dict[str, Any]] = None
+) -> EvidenceStats:
+    """Walk each findings category once, counting everything the factors need."""
+    stage_findings = 0
     
+    # Pathology: diagnosis quality and staging
     score = 0.0
-    
-    for finding in pathology:
-        category = finding.get("category", "").lower()
-        value = (finding.get("value") or "").lower().strip()
+    for finding in findings.get("pathology", []):
+        if score < 1.0:
+            category = finding.get("category", "").lower()
+            value = finding_value_lower(finding)
+            
+            if category == "diagnosis" and value:
+                # Check for specific cancer types
+                if _STRONG_DX_RE.search(value):
+                    score = 1.0
+                # Partial credit for descriptive findings
+                elif _WEAK_DX_RE.search(value):
+                    score = max(score, 0.7)
+                elif value not in _INVALID_DIAGNOSIS_VALUES:
+                    score = max(score, 0.4)
         
-        if category == "diagnosis" and value:
-            # Check for specific cancer types
-            if any(term in value for term in ["carcinoma", "adenocarcinoma", "lymphoma", "leukemia", "sarcoma"]):
-                score = 1.0
-                break
-            # Partial credit for descriptive findings
-            elif any(term in value for term in ["malignant", "neoplasm", "tumor"]):
-                score = max(score, 0.7)
-            elif value not in ["unknown", "pending", "string", "n/a", ""]:
-                score = max(score, 0.4)
+        if _has_stage_value(finding):
+            stage_findings += 1
     
-    return score
+    # Clinical: staging and labs
+    lab_count = valid_labs = 0
+    for finding in findings.get("clinical", []):
+        if _has_stage_value(finding):
+            stage_findings += 1
+        if finding.get("category") == "lab":
+            lab_count += 1
+            value = finding_value_lower(finding)
+            if value and value not in _INVALID_LAB_VALUES:
+                valid_labs += 1
+    
+    valid_biomarkers = 0
+    for biomarker in findings.get("biomarkers") or ():
+        value = finding_value_lower(biomarker)
+        if value and value not in _INVALID_BIOMARKER_VALUES:
+            valid_biomarkers += 1
+    
+    return EvidenceStats(
+        diagnosis_score=score,
+        imaging_count=len(findings.get("imaging") or ()),
+        stage_findings=stage_findings,
+        valid_biomarkers=valid_biomarkers,
+        lab_count=lab_count,
+        valid_labs=valid_labs,
+        has_tnm_stage=bool(staging and staging.get("tnm_staging")),
+        has_clinical_stage=bool(staging and staging.get("clinical_stage")),
+        has_pathological_stage=bool(staging and staging.get("pathological_stage"))
+    )
 
 
-def _assess_imaging_coverage(findings: Dict[str, Any]) -> float:
+def _assess_diagnosis_quality(stats: EvidenceStats) -> float:
+    """Score diagnosis quality from 0-1."""
+    return stats.diagnosis_score
+
+
+def _assess_imaging_coverage(stats: EvidenceStats) -> float:
     """Score imaging coverage from 0-1."""
-    imaging = findings.get("imaging", [])
-    
-    if not imaging:
-        return 0.0
-    
     # More findings = higher score
-    count = len(imaging)
+    count = stats.imaging_count
     if count >= 5:
         return 1.0
     elif count >= 3:
@@ -125,46 +218,27 @@ def _assess_imaging_coverage(findings: Dict[str, Any]) -> float:
     return 0.0
 
 
-def _assess_staging_completeness(
-    findings: Dict[str, Any],
-    staging: Optional[Dict[str, Any]]
-) -> float:
+def _assess_staging_completeness(stats: EvidenceStats) -> float:
     """Score staging completeness from 0-1."""
     score = 0.0
     
-    if staging:
-        if staging.get("tnm_staging"):
-            score += 0.4
-        if staging.get("clinical_stage"):
-            score += 0.3
-        if staging.get("pathological_stage"):
-            score += 0.3
-    
-    # Check findings for staging info
-    for category in ["pathology", "clinical"]:
-        for finding in findings.get(category, []):
-            title = (finding.get("title") or "").lower()
-            if "stage" in title or "tnm" in title:
-                value = finding.get("value", "")
-                if value and value.lower() not in ["unknown", "pending", ""]:
-                    score = min(1.0, score + 0.3)
+    if stats.has_tnm_stage:
+        score += 0.4
+    if stats.has_clinical_stage:
+        score += 0.3
+    if stats.has_pathological_stage:
+        score += 0.3
+    
+    # Each staging finding adds 0.3 (accumulated stepwise, capped at 1)
+    for _ in range(stats.stage_findings):
+        score = min(1.0, score + 0.3)
     
     return min(1.0, score)
 
 
-def _assess_biomarker_quality(findings: Dict[str, Any]) -> float:
+def _assess_biomarker_quality(stats: EvidenceStats) -> float:
     """Score biomarker quality from 0-1."""
-    biomarkers = findings.get("biomarkers", [])
-    
-    if not biomarkers:
-        return 0.0
-    
-    valid_count = 0
-    for biomarker in biomarkers:
-        value = (biomarker.get("value") or "").lower().strip()
-        if value and value not in ["string", "unknown", "n/a", "null", "none", ""]:
-            valid_count += 1
-    
+    valid_count = stats.valid_biomarkers
     if valid_count >= 4:
         return 1.0
     elif valid_count >= 2:
@@ -175,21 +249,12 @@ def _assess_biomarker_quality(findings: Dict[str, Any]) -> float:
     return 0.0
 
 
-def _assess_lab_completeness(findings: Dict[str, Any]) -> float:
+def _assess_lab_completeness(stats: EvidenceStats) -> float:
     """Score lab data completeness from 0-1."""
-    clinical = findings.get("clinical", [])
-    
-    lab_findings = [f for f in clinical if f.get("category") == "lab"]
-    
-    if not lab_findings:
+    if not stats.lab_count:
         return 0.0
     
-    valid_count = 0
-    for lab in lab_findings:
-        value = (lab.get("value") or "").strip()
-        if value and value.lower() not in ["none", "n/a", "null", ""]:
-            valid_count += 1
-    
+    valid_count = stats.valid_labs
     if valid_count >= 10:
         return 1.0
     elif valid_count >= 5:
@@ -203,9 +268,8 @@ def _assess_lab_completeness(findings: Dict[str, Any]) -> float:
 def _generate_justification(factors: Dict[str, float], level: ConfidenceLevel) -> str:
     """Generate human-readable confidence justification."""
     
-    # Find weakest factors
-    sorted_factors = sorted(factors.items(), key=lambda x: x[1])
-    weak = [f[0] for f in sorted_factors if f[1] < 0.1]
+    # Find weakest factors (weakest first)
+    weak = sorted((name for name, score in factors.items() if score < 0.1), key=factors.__getitem__)
     
     if level == ConfidenceLevel.VERY_LOW:
         return f"Insufficient data for reliable conclusions. Missing: {', '.join(weak) if weak else 'multiple factors'}."
@@ -5,6 +5,7 @@ Integrates clinical validation for safety.
 """
 
 import re
+from functools import lru_cache
 from typing import Any, Dict, List, Optional
 
 from .validation import (
@@ -13,7 +14,9 @@ from .validation import (
     filter_biomarkers_by_disease,
     sanitize_recommendations,
     check_critical_findings,
-    is_diagnosis_confirmed
+    is_diagnosis_confirmed,
+    VALUE_LOWER_KEY,
+    TITLE_LOWER_KEY
 )
 from .confidence_calculator import (
     calculate_evidence_based_confidence,
@@ -22,7 +25,7 @@ from .confidence_calculator import (
 
 
 # Placeholder patterns to remove
-PLACEHOLDER_PATTERNS = [
+PLACEHOLDER_PATTERNS = (
     r'^string$',           # Literal "string"
     r'^string \(',         # "string (..."
     r'^Unknown$',          # Just "Unknown"
@@ -31,20 +34,56 @@ PLACEHOLDER_PATTERNS = [
     r'^N/A$',              # Just "N/A"
     r'^\s*$',              # Empty or whitespace
     r'^2-3 sentence',      # Prompt template leaked
-]
+)
+
+# Compiled form of PLACEHOLDER_PATTERNS with the anchors factored out (the
+# match is anchored at the start; blank values are handled before matching)
+PLACEHOLDER_REGEX = re.compile(r'(?:string|unknown|none|null|n/a)$|string \(|2-3 sentence', re.IGNORECASE)
 
-# Compile for performance
-PLACEHOLDER_REGEX = re.compile('|'.join(PLACEHOLDER_PATTERNS), re.IGNORECASE)
+# Same test split into a set of exact (lowercased) values and two prefixes.
+# Only valid for ASCII text: for other text lower() and the regex's case
+# folding disagree (e.g. "ſtring"), so that goes through PLACEHOLDER_REGEX.
+_EXACT_PLACEHOLDERS = frozenset({"string", "unknown", "none", "null", "n/a"})
+_PLACEHOLDER_PREFIXES = ("string (", "2-3 sentence")
 
 # Duplicate unit patterns
-DUPLICATE_UNIT_PATTERNS = [
+DUPLICATE_UNIT_PATTERNS = (
     (r'(\w+/\w+)\s+\1', r'\1'),          # "g/dL g/dL" -> "g/dL"
     (r'(\%)\s+\1', r'\1'),                # "% %" -> "%"
     (r'(lakh/cu\.mm)\s+lakh/cu\.mm', r'\1'),
     (r'(million/cu\.mm)\s+million/cu\.mm', r'\1'),
     (r'(pg)\s+pg', r'\1'),                # "pg pg" -> "pg"
     (r'(fL)\s+fL', r'\1'),                # "fL fL" -> "fL"
-]
+)
+
+# All duplicate-unit patterns as one alternation, so a value is scanned
+# once. Each alternative captures the unit to keep as its only group;
+# backreferences are renumbered to each alternative's own group.
+_DUPLICATE_UNIT_REGEX = re.compile('|'.join((
+    r'(\w+/\w+)\s+\1',
+    r'(\%)\s+\2',
+    r'(lakh/cu\.mm)\s+lakh/cu\.mm',
+    r'(million/cu\.mm)\s+million/cu\.mm',
+    r'(pg)\s+pg',
+    r'(fL)\s+fL',
+)))
+
+
+def _keep_unit(match: 're.Match') -> str:
+    return match.group(match.lastindex)
+
+
+# Finding categories of a multi-agent view, in display order
+FINDING_CATEGORIES = ('imaging', 'pathology', 'clinical', 'biomarkers')
+
+# Trial-name terms that mark a trial as the wrong disease for a category:
+# no solid-tumor trials for hematologic patients and vice versa
+_HEME_EXCLUDE = ("breast", "lung", "colon")
+_BREAST_EXCLUDE = ("leukemia", "lymphoma", "myeloma")
+_TRIAL_EXCLUDE_BY_CATEGORY = {
+    "hematologic": _HEME_EXCLUDE,
+    "breast": _BREAST_EXCLUDE
+}
 
 # Gender standardization
 GENDER_MAP = {
@@ -63,25 +102,43 @@ def is_placeholder(value: Any) -> bool:
         return True
     if not isinstance(value, str):
         return False
-    return bool(PLACEHOLDER_REGEX.match(value.strip()))
+    return _is_placeholder_str(value)
+
+
+# Titles, units and placeholder strings repeat heavily across findings, so
+# the string checks below are memoized (bounded; inputs are short strings)
+@lru_cache(maxsize=4096)
+def _is_placeholder_str(value: str) -> bool:
+    stripped = value.strip()
+    if not stripped:
+        return True
+    if not stripped.isascii():
+        return PLACEHOLDER_REGEX.match(stripped) is not None
+    lowered = stripped.lower()
+    return lowered in _EXACT_PLACEHOLDERS or lowered.startswith(_PLACEHOLDER_PREFIXES)
 
 
 def clean_value(value: str) -> str:
     """Clean a value string by removing duplicate units and trimming."""
     if not value or not isinstance(value, str):
         return value or ""
-    
+    return _clean_str(value)
+
+
+@lru_cache(maxsize=4096)
+def _clean_str(value: str) -> str:
     cleaned = value.strip()
     
     # Fix duplicate units
-    for pattern, replacement in DUPLICATE_UNIT_PATTERNS:
-        cleaned = re.sub(pattern, replacement, cleaned)
+    cleaned = _DUPLICATE_UNIT_REGEX.sub(_keep_unit, cleaned)
     
     # Remove trailing "(None)"
-    cleaned = re.sub(r'\s*\(None\)\s*$', '', cleaned)
+    if cleaned.endswith('(None)'):
+        cleaned = cleaned[:-6].rstrip()
     
-    # Remove "None" at end
-    cleaned = re.sub(r'\s+None$', '', cleaned)
+    # Remove "None" at end (as a separate word)
+    if cleaned.endswith('None') and cleaned[-5:-4].isspace():
+        cleaned = cleaned[:-4].rstrip()
     
     return cleaned.strip()
 
@@ -119,12 +176,13 @@ def clean_finding(finding: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         if finding.get('category') != 'lab':
             return None
     
-    return {
-        **finding,
-        'title': clean_value(title),
-        'value': cleaned_value,
-        'interpretation': clean_value(finding.get('interpretation', '')) or None
-    }
+    interpretation = finding.get('interpretation')
+    
+    cleaned = finding.copy()
+    cleaned['title'] = clean_value(title)
+    cleaned['value'] = cleaned_value
+    cleaned['interpretation'] = (clean_value(interpretation) or None) if interpretation else None
+    return cleaned
 
 
 def clean_recommendation(rec: Dict[str, Any]) -> Optional[Dict[str, Any]]:
@@ -136,11 +194,10 @@ def clean_recommendation(rec: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     if is_placeholder(text) or not text.strip():
         return None
     
-    return {
-        **rec,
-        'text': clean_value(text),
-        'rationale': clean_value(rec.get('rationale', '')) or None
-    }
+    cleaned = rec.copy()
+    cleaned['text'] = clean_value(text)
+    cleaned['rationale'] = clean_value(rec.get('rationale', '')) or None
+    return cleaned
 
 
 def clean_clinical_trial(trial: Dict[str, Any], disease_category: str = None) -> Optional[Dict[str, Any]]:
@@ -153,12 +210,10 @@ def clean_clinical_trial(trial: Dict[str, Any], disease_category: str = None) ->
         return None
     
     # Check for disease mismatch if we know the category
-    if disease_category and disease_category != "unknown":
+    excludes = _TRIAL_EXCLUDE_BY_CATEGORY.get(disease_category)
+    if excludes:
         name_lower = name.lower()
-        # Prevent breast cancer trials for hematologic patients and vice versa
-        if disease_category == "hematologic" and any(term in name_lower for term in ["breast", "lung", "colon"]):
-            return None
-        if disease_category == "breast" and any(term in name_lower for term in ["leukemia", "lymphoma", "myeloma"]):
+        if any(term in name_lower for term in excludes):
             return None
     
     return {
@@ -168,6 +223,36 @@ def clean_clinical_trial(trial: Dict[str, Any], disease_category: str = None) ->
     }
 
 
+def _clean_findings_batch(findings: Dict[str, List[Dict[str, Any]]]) -> None:
+    """
+    Clean every finding list in place, dropping invalid findings. Each
+    cleaned finding also gets lowercased copies of its value and title for
+    validation and confidence scoring (see _strip_lowered_keys).
+    """
+    for category in FINDING_CATEGORIES:
+        if category in findings:
+            cleaned_list = [f for f in map(clean_finding, findings[category]) if f]
+            for f in cleaned_list:
+                value, title = f['value'], f['title']
+                if isinstance(value, str):
+                    f[VALUE_LOWER_KEY] = value.lower()
+                else:
+                    f.pop(VALUE_LOWER_KEY, None)
+                if isinstance(title, str):
+                    f[TITLE_LOWER_KEY] = title.lower()
+                else:
+                    f.pop(TITLE_LOWER_KEY, None)
+            findings[category] = cleaned_list
+
+
+def _strip_lowered_keys(findings: Dict[str, List[Dict[str, Any]]]) -> None:
+    """Remove the working keys added by _clean_findings_batch."""
+    for category in FINDING_CATEGORIES:
+        for f in findings.get(category) or ():
+            f.pop(VALUE_LOWER_KEY, None)
+            f.pop(TITLE_LOWER_KEY, None)
+
+
 def clean_multi_agent_view(view: Dict[str, Any]) -> Dict[str, Any]:
     """
     Clean the entire multi-agent view with clinical validation.
@@ -190,21 +275,15 @@ def clean_multi_agent_view(view: Dict[str, Any]) -> Dict[str, Any]:
     
     # Clean findings first
     findings = cleaned.get('findings', {})
-    for category in ['imaging', 'pathology', 'clinical', 'biomarkers']:
-        if category in findings:
-            cleaned_list = []
-            for f in findings[category]:
-                cleaned_f = clean_finding(f)
-                if cleaned_f:
-                    cleaned_list.append(cleaned_f)
-            findings[category] = cleaned_list
+    _clean_findings_batch(findings)
+    has_findings = any(findings.get(category) for category in FINDING_CATEGORIES)
     
-    # Detect disease category
-    disease_category = detect_disease_category(findings)
+    # Detect disease category (nothing to infer it from in an empty view)
+    disease_category = detect_disease_category(findings) if has_findings else "unknown"
     cleaned['detected_disease_category'] = disease_category
     
     # Filter biomarkers by disease relevance
-    if 'biomarkers' in findings:
+    if has_findings and 'biomarkers' in findings:
         findings['biomarkers'] = filter_biomarkers_by_disease(
             findings['biomarkers'], 
             disease_category
@@ -228,7 +307,7 @@ def clean_multi_agent_view(view: Dict[str, Any]) -> Dict[str, Any]:
     
     # Add validation warnings
     existing_warnings = cleaned.get('warnings', [])
-    cleaned['warnings'] = list(set(existing_warnings + validation.warnings))
+    cleaned['warnings'] = list(dict.fromkeys(existing_warnings + validation.warnings))
     
     # Sanitize recommendations if diagnosis not confirmed
     if 'recommendations' in cleaned:
@@ -261,13 +340,13 @@ def clean_multi_agent_view(view: Dict[str, Any]) -> Dict[str, Any]:
             cleaned_t = clean_clinical_trial(trial, disease_category)
             if cleaned_t:
                 cleaned_trials.append(cleaned_t)
-        cleaned['clinical_trials'] = cleaned_trials
         
         # Remove trials entirely if diagnosis not confirmed
         if not validation.is_safe_for_treatment_recs:
-            cleaned['clinical_trials'] = []
-            if cleaned.get('clinical_trials'):
+            if cleaned_trials:
                 cleaned['warnings'].append("⚠️ Clinical trials removed - diagnosis confirmation required for eligibility.")
+            cleaned_trials = []
+        cleaned['clinical_trials'] = cleaned_trials
     
     # Recalculate confidence based on evidence
     confidence_assessment = calculate_evidence_based_confidence(findings, cleaned.get('staging'))
@@ -279,6 +358,7 @@ def clean_multi_agent_view(view: Dict[str, Any]) -> Dict[str, Any]:
     if is_placeholder(cleaned.get('executive_summary')):
         cleaned['executive_summary'] = generate_fallback_summary(cleaned, validation)
     
+    _strip_lowered_keys(findings)
     return cleaned
 
 
@@ -308,7 +388,7 @@ def generate_fallback_summary(view: Dict[str, Any], validation=None) -> str:
     
     # Count findings
     findings = view.get('findings', {})
-    total_findings = sum(len(findings.get(k, [])) for k in ['imaging', 'pathology', 'clinical', 'biomarkers'])
+    total_findings = sum(len(findings.get(k, [])) for k in FINDING_CATEGORIES)
     
     if total_findings > 0:
         parts.append(f"Analysis identified {total_findings} clinical findings.")
@@ -5,10 +5,21 @@ Implements evidence-based validation to ensure safe AI outputs.
 Blocks treatment recommendations until sufficient diagnostic evidence exists.
 """
 
+import bisect
+import hashlib
+import json
+import re
+import threading
+from collections import OrderedDict
 from typing import Dict, List, Any, Tuple, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from enum import Enum
 
+try:
+    import numpy as np
+except ImportError:  # Optional speedup for validate_batch; a Python loop is used otherwise
+    np = None
+
 
 class DiagnosticStatus(Enum):
     """Status levels for tumor board case readiness."""
@@ -18,6 +29,36 @@ class DiagnosticStatus(Enum):
     READY_FOR_REVIEW = "ready_for_review"
 
 
+# Completeness factors in scoring order (diagnosis, imaging, staging,
+# pathology, labs): weight in hundredths, and the label reported when the
+# factor is missing. Integer weights sum exactly; the score is points / 100.
+COMPLETENESS_WEIGHTS = (30, 20, 20, 15, 15)
+MISSING_DATA_LABELS = (
+    "Confirmed pathological diagnosis",
+    "Imaging/radiology data",
+    "Cancer staging (TNM)",
+    "Pathology confirmation",
+    "Complete laboratory workup",
+)
+
+# Warning raised when each readiness check fails, in report order
+_WARNING_RULES = (
+    ("imaging_available", "⚠️ No imaging data available. Imaging required before tumor board conclusions."),
+    ("diagnosis_confirmed", "⚠️ Diagnosis pending. Treatment recommendations are preliminary only."),
+    ("pathology_present", "⚠️ Pathology confirmation required before treatment initiation."),
+    ("staging_available", "⚠️ Staging data incomplete. Cannot determine treatment eligibility."),
+)
+
+# determine_status: a score below _STATUS_THRESHOLDS[i] maps to _STATUSES[i]
+_STATUS_THRESHOLDS = (0.3, 0.5, 0.7)
+_STATUSES = (
+    DiagnosticStatus.DIAGNOSTIC_WORKUP_REQUIRED,
+    DiagnosticStatus.PENDING_CONFIRMATION,
+    DiagnosticStatus.PRELIMINARY,
+    DiagnosticStatus.READY_FOR_REVIEW,
+)
+
+
 @dataclass
 class ValidationResult:
     """Result of clinical validation checks."""
@@ -29,6 +70,13 @@ class ValidationResult:
     complexity_override: Optional[str] = None
 
 
+# Recent validate_for_treatment_recommendations() results, keyed by
+# _validation_key(). Validation is a pure function of findings and staging.
+_VALIDATION_CACHE_SIZE = 512
+_validation_cache: "OrderedDict[bytes, ValidationResult]" = OrderedDict()
+_validation_cache_lock = threading.Lock()
+
+
 # Disease category to relevant biomarker mapping
 DISEASE_BIOMARKER_MAP = {
     "breast": ["ER", "PR", "HER2", "Ki-67", "BRCA1", "BRCA2"],
@@ -41,6 +89,95 @@ DISEASE_BIOMARKER_MAP = {
     "unknown": []  # No biomarkers filtered for unknown disease
 }
 
+# Uppercased once for filter_biomarkers_by_disease
+DISEASE_BIOMARKER_UPPER = {
+    category: tuple(marker.upper() for marker in markers)
+    for category, markers in DISEASE_BIOMARKER_MAP.items()
+}
+
+# Markers kept for every disease category
+GENERIC_BIOMARKERS = ("LDH", "AFP", "CEA", "CA-125", "CA-19")
+
+# Everything filter_biomarkers_by_disease keeps for a category (relevant plus
+# generic markers), as substrings to look for and as exact names
+_BIOMARKER_KEEP_TERMS = {
+    category: markers + GENERIC_BIOMARKERS
+    for category, markers in DISEASE_BIOMARKER_UPPER.items()
+    if markers
+}
+_BIOMARKER_KEEP_NAMES = {
+    category: frozenset(terms)
+    for category, terms in _BIOMARKER_KEEP_TERMS.items()
+}
+
+# Diagnosis terms per disease category, in priority order: the first
+# category with any term in the diagnosis wins
+DISEASE_DIAGNOSIS_TERMS = (
+    ("breast", ("breast", "mammary")),
+    ("lung", ("lung", "pulmonary", "bronchial")),
+    ("colorectal", ("colon", "rectal", "colorectal", "bowel")),
+    ("hematologic", ("blood", "leukemia", "lymphoma", "myeloma", "hematologic")),
+    ("prostate", ("prostate",)),
+    ("ovarian", ("ovary", "ovarian")),
+    ("melanoma", ("melanoma", "skin")),
+)
+
+_DISEASE_TERM_RANK = {
+    term: rank
+    for rank, (_, terms) in enumerate(DISEASE_DIAGNOSIS_TERMS)
+    for term in terms
+}
+
+# One pass over the diagnosis for all terms; the lookahead also reports
+# matches that overlap an earlier one
+_DISEASE_TERM_RE = re.compile(
+    "(?=(" + "|".join(sorted(map(re.escape, _DISEASE_TERM_RANK), key=len, reverse=True)) + "))"
+)
+
+# Clinical finding titles that point to a hematologic workup
+HEMATOLOGIC_INDICATORS = ("wbc", "rbc", "hemoglobin", "platelet", "blast", "lymphocyte")
+
+# Clinical finding titles checked against CRITICAL_THRESHOLDS
+HEMOGLOBIN_KEYS = ("hemoglobin", "hb", "hgb")
+PLATELET_KEYS = ("platelet",)
+WBC_KEYS = ("wbc", "leucocyte", "leukocyte")
+# All of the keys above in one scan, each match naming its lab (a lookahead,
+# so every key in the title is reported, not just non-overlapping ones)
+_CRITICAL_LAB_RE = re.compile("(?=" + "|".join(
+    f"(?P<{lab}>{'|'.join(map(re.escape, keys))})"
+    for lab, keys in (("hemoglobin", HEMOGLOBIN_KEYS), ("platelet", PLATELET_KEYS), ("wbc", WBC_KEYS))
+) + ")")
+
+# Diagnosis values that do not count as a confirmed diagnosis
+INVALID_DIAGNOSES = frozenset({
+    "blood", "unknown", "pending", "suspected", "possible",
+    "n/a", "none", "string", "null", ""
+})
+
+# A confirmed diagnosis must name one of these
+CONFIRMED_DIAGNOSIS_TERMS = ("carcinoma", "lymphoma", "leukemia", "sarcoma", "melanoma", "adenoma", "myeloma")
+
+# Finding titles that carry staging information, and values that don't count
+STAGING_TITLE_TERMS = ("stage", "tnm", "t1", "t2", "t3", "t4", "n0", "n1", "m0", "m1")
+INVALID_STAGE_VALUES = frozenset({"unknown", "pending", "n/a", ""})
+
+# Pathology values that are placeholders rather than data
+PATHOLOGY_PLACEHOLDER_VALUES = frozenset({"string", "unknown", "n/a", "null", "none", ""})
+
+# Recommendations allowed before the diagnosis is confirmed: by category,
+# or by diagnostic intent in the text
+DIAGNOSTIC_CATEGORIES = frozenset({"diagnostic", "imaging", "biopsy", "referral", "workup", "consultation"})
+DIAGNOSTIC_INTENT_TERMS = ("confirm", "rule out", "evaluate", "assess", "test", "biopsy", "imaging", "refer")
+
+# Each term tuple above searched as one compiled alternation
+_CANCER_RE = re.compile('|'.join(map(re.escape, CONFIRMED_DIAGNOSIS_TERMS)))
+_STAGE_RE = re.compile('|'.join(map(re.escape, STAGING_TITLE_TERMS)))
+_DIAG_INTENT_RE = re.compile('|'.join(map(re.escape, DIAGNOSTIC_INTENT_TERMS)))
+
+# First run of digits and dots in a lab value; signs and exponents are not
+# part of the number
+_NUM_RE = re.compile(r'[\d.]+')
+
 # Critical lab thresholds for complexity escalation
 CRITICAL_THRESHOLDS = {
     "hemoglobin": {"low": 7.0, "unit": "g/dL"},
@@ -51,28 +188,44 @@ CRITICAL_THRESHOLDS = {
 }
 
 
+# Lowercased copies of a finding's value/title, added by clean_multi_agent_view
+# while it cleans so the checks below don't lowercase the same strings again
+VALUE_LOWER_KEY = "_value_lower"
+TITLE_LOWER_KEY = "_title_lower"
+
+
+def finding_value_lower(finding: Dict[str, Any]) -> str:
+    """Lowercased, stripped finding value."""
+    value = finding.get(VALUE_LOWER_KEY)
+    if value is None:
+        value = (finding.get("value") or "").lower().strip()
+    return value
+
+
+def finding_title_lower(finding: Dict[str, Any]) -> str:
+    """Lowercased finding title."""
+    title = finding.get(TITLE_LOWER_KEY)
+    if title is None:
+        title = (finding.get("title") or "").lower()
+    return title
+
+
 def is_diagnosis_confirmed(findings: Dict[str, Any]) -> bool:
     """
     Check if a definitive diagnosis exists (not just 'blood', 'unknown', 'pending').
     
     Returns True only if pathology confirms a specific cancer/disease type.
     """
-    invalid_diagnoses = [
-        "blood", "unknown", "pending", "suspected", "possible",
-        "n/a", "none", "string", "null", ""
-    ]
-    
     # Check pathology findings for confirmed diagnosis
     pathology_findings = findings.get("pathology", [])
     for finding in pathology_findings:
         if finding.get("category") == "diagnosis":
-            value = (finding.get("value") or "").lower().strip()
-            title = (finding.get("title") or "").lower()
+            value = finding_value_lower(finding)
             
             # Check if it's a real diagnosis
-            if value and value not in invalid_diagnoses:
+            if value and value not in INVALID_DIAGNOSES:
                 # Must have some specificity
-                if any(term in value for term in ["carcinoma", "lymphoma", "leukemia", "sarcoma", "melanoma", "adenoma", "myeloma"]):
+                if _CANCER_RE.search(value):
                     return True
     
     return False
@@ -89,10 +242,10 @@ def is_staging_available(findings: Dict[str, Any], staging: Dict[str, Any] = Non
     # Check findings for staging info
     for category in ["pathology", "clinical"]:
         for finding in findings.get(category, []):
-            title = (finding.get("title") or "").lower()
-            if any(term in title for term in ["stage", "tnm", "t1", "t2", "t3", "t4", "n0", "n1", "m0", "m1"]):
+            title = finding_title_lower(finding)
+            if _STAGE_RE.search(title):
                 value = finding.get("value", "")
-                if value and value.lower() not in ["unknown", "pending", "n/a", ""]:
+                if value and value.lower() not in INVALID_STAGE_VALUES:
                     return True
     
     return False
@@ -102,51 +255,78 @@ def has_imaging_data(findings: Dict[str, Any]) -> bool:
     """
     Check if any imaging/radiology data is present.
     """
-    imaging = findings.get("imaging", [])
-    return len(imaging) > 0
+    return bool(findings.get("imaging"))
 
 
 def has_pathology_confirmation(findings: Dict[str, Any]) -> bool:
     """
     Check if pathology report data exists (not just placeholder).
     """
-    pathology = findings.get("pathology", [])
+    pathology = findings.get("pathology")
+    if not pathology:
+        return False
     
     # Need at least one real pathology finding
     for finding in pathology:
-        value = (finding.get("value") or "").lower().strip()
-        if value and value not in ["string", "unknown", "n/a", "null", "none", ""]:
+        value = finding_value_lower(finding)
+        if value and value not in PATHOLOGY_PLACEHOLDER_VALUES:
             return True
     
     return False
 
 
-def detect_disease_category(findings: Dict[str, Any], diagnosis: str = None) -> str:
+def _pathology_summary(findings: Dict[str, Any]) -> Tuple[bool, bool]:
+    """
+    is_diagnosis_confirmed() and has_pathology_confirmation() from one walk
+    over the pathology findings.
+    
+    Returns: (diagnosis_confirmed, pathology_present)
+    """
+    diagnosis_confirmed = pathology_present = False
+    
+    for finding in findings.get("pathology") or ():
+        is_diagnosis = finding.get("category") == "diagnosis"
+        if pathology_present and not is_diagnosis:
+            continue
+        
+        value = finding_value_lower(finding)
+        if not value:
+            continue
+        
+        if not pathology_present and value not in PATHOLOGY_PLACEHOLDER_VALUES:
+            pathology_present = True
+        if is_diagnosis and value not in INVALID_DIAGNOSES and _CANCER_RE.search(value):
+            diagnosis_confirmed = True
+            if pathology_present:
+                break
+    
+    return diagnosis_confirmed, pathology_present
+
+
+def detect_disease_category(
+    findings: Dict[str, Any],
+    diagnosis: str = None,
+    hematologic_count: Optional[int] = None
+) -> str:
     """
     Infer disease category from findings to validate biomarker relevance.
+    
+    hematologic_count may be passed in from _scan_clinical() to skip
+    rescanning the clinical findings.
     """
     diagnosis_lower = (diagnosis or "").lower()
     
-    # Check for explicit disease category mentions
-    if any(term in diagnosis_lower for term in ["breast", "mammary"]):
-        return "breast"
-    if any(term in diagnosis_lower for term in ["lung", "pulmonary", "bronchial"]):
-        return "lung"
-    if any(term in diagnosis_lower for term in ["colon", "rectal", "colorectal", "bowel"]):
-        return "colorectal"
-    if any(term in diagnosis_lower for term in ["blood", "leukemia", "lymphoma", "myeloma", "hematologic"]):
-        return "hematologic"
-    if any(term in diagnosis_lower for term in ["prostate"]):
-        return "prostate"
-    if any(term in diagnosis_lower for term in ["ovary", "ovarian"]):
-        return "ovarian"
-    if any(term in diagnosis_lower for term in ["melanoma", "skin"]):
-        return "melanoma"
+    # Check for explicit disease category mentions (the lowest-ranked
+    # category among all matched terms, not the leftmost match)
+    if diagnosis_lower:
+        terms = _DISEASE_TERM_RE.findall(diagnosis_lower)
+        if terms:
+            return DISEASE_DIAGNOSIS_TERMS[min(map(_DISEASE_TERM_RANK.__getitem__, terms))][0]
     
     # Check clinical findings for hematologic indicators
-    clinical = findings.get("clinical", [])
-    hematologic_indicators = ["wbc", "rbc", "hemoglobin", "platelet", "blast", "lymphocyte"]
-    hematologic_count = sum(1 for f in clinical if any(ind in (f.get("title") or "").lower() for ind in hematologic_indicators))
+    if hematologic_count is None:
+        clinical = findings.get("clinical", [])
+        hematologic_count = sum(1 for f in clinical if any(ind in finding_title_lower(f) for ind in HEMATOLOGIC_INDICATORS))
     
     if hematologic_count >= 3:
         return "hematologic"
@@ -156,121 +336,175 @@ def detect_disease_category(findings: Dict[str, Any], diagnosis: str = None) ->
 
 def calculate_data_completeness_score(
     findings: Dict[str, Any],
-    staging: Dict[str, Any] = None
+    staging: Dict[str, Any] = None,
+    lab_count: Optional[int] = None,
+    diagnosis_confirmed: Optional[bool] = None,
+    imaging_available: Optional[bool] = None,
+    staging_available: Optional[bool] = None,
+    pathology_present: Optional[bool] = None
 ) -> Tuple[float, List[str]]:
     """
     Calculate evidence-based completeness score (0.0 - 1.0).
     
+    lab_count (from _scan_clinical()) and the four predicates may be passed
+    in by a caller that already has them; anything left as None is computed.
+    
     Returns: (score, list of missing items)
     """
-    weights = {
-        "diagnosis_confirmed": 0.30,
-        "imaging_available": 0.20,
-        "staging_available": 0.20,
-        "pathology_present": 0.15,
-        "labs_present": 0.15
-    }
-    
-    score = 0.0
+    points = 0
     missing = []
     
-    # Check each factor
-    if is_diagnosis_confirmed(findings):
-        score += weights["diagnosis_confirmed"]
-    else:
-        missing.append("Confirmed pathological diagnosis")
-    
-    if has_imaging_data(findings):
-        score += weights["imaging_available"]
-    else:
-        missing.append("Imaging/radiology data")
-    
-    if is_staging_available(findings, staging):
-        score += weights["staging_available"]
-    else:
-        missing.append("Cancer staging (TNM)")
-    
-    if has_pathology_confirmation(findings):
-        score += weights["pathology_present"]
-    else:
-        missing.append("Pathology confirmation")
+    if diagnosis_confirmed is None and pathology_present is None:
+        diagnosis_confirmed, pathology_present = _pathology_summary(findings)
+    if diagnosis_confirmed is None:
+        diagnosis_confirmed = is_diagnosis_confirmed(findings)
+    if imaging_available is None:
+        imaging_available = bool(findings.get("imaging"))
+    if staging_available is None:
+        staging_available = is_staging_available(findings, staging)
+    if pathology_present is None:
+        pathology_present = has_pathology_confirmation(findings)
     
     # Check labs
-    clinical = findings.get("clinical", [])
-    lab_count = sum(1 for f in clinical if f.get("category") == "lab")
-    if lab_count >= 3:
-        score += weights["labs_present"]
-    else:
-        missing.append("Complete laboratory workup")
+    if lab_count is None:
+        clinical = findings.get("clinical", [])
+        lab_count = sum(1 for f in clinical if f.get("category") == "lab")
     
-    return round(score, 2), missing
+    # Check each factor
+    present = (diagnosis_confirmed, imaging_available, staging_available, pathology_present, lab_count >= 3)
+    for ok, weight, label in zip(present, COMPLETENESS_WEIGHTS, MISSING_DATA_LABELS):
+        if ok:
+            points += weight
+        else:
+            missing.append(label)
+    
+    return points / 100, missing
 
 
 def determine_status(score: float) -> DiagnosticStatus:
     """Map completeness score to diagnostic status."""
-    if score < 0.3:
-        return DiagnosticStatus.DIAGNOSTIC_WORKUP_REQUIRED
-    elif score < 0.5:
-        return DiagnosticStatus.PENDING_CONFIRMATION
-    elif score < 0.7:
-        return DiagnosticStatus.PRELIMINARY
-    else:
-        return DiagnosticStatus.READY_FOR_REVIEW
+    # bisect_right: a score equal to a threshold belongs to the tier above
+    return _STATUSES[bisect.bisect_right(_STATUS_THRESHOLDS, score)]
 
 
-def check_critical_findings(findings: Dict[str, Any]) -> Tuple[bool, Optional[str], List[str]]:
+def _lab_number(value: Any) -> Optional[float]:
+    """First number in a lab value (units stripped), or None if there isn't one."""
+    # Plain JSON numbers whose str() would give back the same digits
+    value_type = type(value)
+    if value_type is int and 0 <= value < 10**16:
+        return float(value)
+    if value_type is float and 1e-4 <= value < 1e16:
+        return value
+    
+    match = _NUM_RE.search(str(value))
+    if match is None:
+        return None
+    try:
+        return float(match.group())
+    except ValueError:  # e.g. "1.2.3"
+        return None
+
+
+def _scan_clinical(clinical: List[Dict[str, Any]]) -> Tuple[int, int, List[str], bool]:
     """
-    Check for critical lab values that require complexity escalation.
+    One pass over the clinical findings for everything validation needs
+    from them.
     
-    Returns: (has_critical, complexity_override, warning_list)
+    Returns: (lab_count, hematologic_count, critical_warnings, has_critical)
     """
+    lab_count = 0
+    hematologic_count = 0
     warnings = []
-    has_critical = False
-    
-    clinical = findings.get("clinical", [])
     
     for finding in clinical:
-        title = (finding.get("title") or "").lower()
-        value_str = finding.get("value", "")
+        if finding.get("category") == "lab":
+            lab_count += 1
+        
+        title = finding_title_lower(finding)
+        if any(ind in title for ind in HEMATOLOGIC_INDICATORS):
+            hematologic_count += 1
+        
+        # Which critical labs the title names; only those are worth parsing
+        # a number for
+        labs = {match.lastgroup for match in _CRITICAL_LAB_RE.finditer(title)}
+        if not labs:
+            continue
         
         # Try to extract numeric value
-        try:
-            # Remove units and parse number
-            import re
-            numbers = re.findall(r'[\d.]+', str(value_str))
-            if numbers:
-                value = float(numbers[0])
-            else:
-                continue
-        except:
+        value = _lab_number(finding.get("value", ""))
+        if value is None:
             continue
         
         # Check hemoglobin
-        if "hemoglobin" in title or "hb" in title or "hgb" in title:
+        if "hemoglobin" in labs:
             if value < CRITICAL_THRESHOLDS["hemoglobin"]["low"]:
-                has_critical = True
                 warnings.append(f"⚠️ CRITICAL: Severe anemia (Hgb {value} g/dL)")
         
         # Check platelets
-        if "platelet" in title:
+        if "platelet" in labs:
             if value < CRITICAL_THRESHOLDS["platelet"]["low"]:
-                has_critical = True
                 warnings.append(f"⚠️ CRITICAL: Severe thrombocytopenia (Plt {value})")
         
         # Check WBC
-        if "wbc" in title or "leucocyte" in title or "leukocyte" in title:
+        if "wbc" in labs:
             threshold = CRITICAL_THRESHOLDS["wbc"]
             if value < threshold["low"]:
-                has_critical = True
                 warnings.append(f"⚠️ CRITICAL: Severe leukopenia (WBC {value})")
             elif value > threshold["high"]:
-                has_critical = True
                 warnings.append(f"⚠️ CRITICAL: Leukocytosis (WBC {value})")
     
+    return lab_count, hematologic_count, warnings, bool(warnings)
+
+
+def check_critical_findings(findings: Dict[str, Any]) -> Tuple[bool, Optional[str], List[str]]:
+    """
+    Check for critical lab values that require complexity escalation.
+    
+    Returns: (has_critical, complexity_override, warning_list)
+    """
+    _, _, warnings, has_critical = _scan_clinical(findings.get("clinical", []))
+    
     complexity_override = "high" if has_critical else None
     return has_critical, complexity_override, warnings
 
 
+def _readiness_warnings(
+    critical_warnings: List[str],
+    diagnosis_confirmed: bool,
+    imaging_available: bool,
+    staging_available: bool,
+    pathology_present: bool
+) -> List[str]:
+    """Critical lab warnings followed by one warning per missing prerequisite."""
+    checks = {
+        "diagnosis_confirmed": diagnosis_confirmed,
+        "imaging_available": imaging_available,
+        "staging_available": staging_available,
+        "pathology_present": pathology_present
+    }
+    warnings = list(critical_warnings)
+    warnings.extend(message for check, message in _WARNING_RULES if not checks[check])
+    return warnings
+
+
+def _validation_key(findings: Dict[str, Any], staging: Optional[Dict[str, Any]]) -> Optional[bytes]:
+    """Digest of the validation input, or None if it is not plain JSON data."""
+    try:
+        payload = json.dumps([findings, staging], sort_keys=True, separators=(",", ":"))
+    except (TypeError, ValueError):
+        return None
+    return hashlib.blake2b(payload.encode(), digest_size=16).digest()
+
+
+def _copy_result(result: ValidationResult) -> ValidationResult:
+    """Copy of a cached result whose lists the caller may keep or modify."""
+    return replace(
+        result,
+        missing_critical_data=list(result.missing_critical_data),
+        warnings=list(result.warnings)
+    )
+
+
 def validate_for_treatment_recommendations(
     findings: Dict[str, Any],
     staging: Dict[str, Any] = None,
@@ -279,40 +513,59 @@ def validate_for_treatment_recommendations(
     """
     Main validation function - determines if case is safe for treatment recommendations.
     
+    Re-validating content already seen (retries, re-reads of the same case)
+    is answered from a small LRU cache keyed by a digest of the findings and
+    staging.
+    
     Returns ValidationResult with all safety checks.
     """
+    key = _validation_key(findings, staging)
+    if key is not None:
+        with _validation_cache_lock:
+            cached = _validation_cache.get(key)
+            if cached is not None:
+                _validation_cache.move_to_end(key)
+        if cached is not None:
+            return _copy_result(cached)
+    
+    # Each check runs once; the score, warnings and safety gate share them
+    diagnosis_confirmed, pathology_present = _pathology_summary(findings)
+    imaging_available = bool(findings.get("imaging"))  # has_imaging_data(), inlined
+    staging_available = is_staging_available(findings, staging)
+    
+    # Lab count and critical lab values, from one pass over the clinical findings
+    lab_count, _, critical_warnings, has_critical = _scan_clinical(findings.get("clinical", []))
+    
     # Calculate base score
-    score, missing = calculate_data_completeness_score(findings, staging)
+    score, missing = calculate_data_completeness_score(
+        findings,
+        staging,
+        lab_count=lab_count,
+        diagnosis_confirmed=diagnosis_confirmed,
+        imaging_available=imaging_available,
+        staging_available=staging_available,
+        pathology_present=pathology_present
+    )
     
     # Determine status
     status = determine_status(score)
     
     # Check critical findings
-    has_critical, complexity_override, critical_warnings = check_critical_findings(findings)
+    complexity_override = "high" if has_critical else None
     
     # Generate standard warnings
-    warnings = list(critical_warnings)
-    
-    if not has_imaging_data(findings):
-        warnings.append("⚠️ No imaging data available. Imaging required before tumor board conclusions.")
-    
-    if not is_diagnosis_confirmed(findings):
-        warnings.append("⚠️ Diagnosis pending. Treatment recommendations are preliminary only.")
-    
-    if not has_pathology_confirmation(findings):
-        warnings.append("⚠️ Pathology confirmation required before treatment initiation.")
-    
-    if not is_staging_available(findings, staging):
-        warnings.append("⚠️ Staging data incomplete. Cannot determine treatment eligibility.")
+    warnings = _readiness_warnings(
+        critical_warnings, diagnosis_confirmed, imaging_available, staging_available, pathology_present
+    )
     
     # Determine if safe for treatment recs
     is_safe = (
         score >= 0.5 and
-        is_diagnosis_confirmed(findings) and
-        has_pathology_confirmation(findings)
+        diagnosis_confirmed and
+        pathology_present
     )
     
-    return ValidationResult(
+    result = ValidationResult(
         is_safe_for_treatment_recs=is_safe,
         data_completeness_score=score,
         status=status,
@@ -320,6 +573,81 @@ def validate_for_treatment_recommendations(
         warnings=warnings,
         complexity_override=complexity_override
     )
+    
+    if key is not None:
+        with _validation_cache_lock:
+            _validation_cache[key] = result
+            _validation_cache.move_to_end(key)
+            if len(_validation_cache) > _VALIDATION_CACHE_SIZE:
+                _validation_cache.popitem(last=False)
+    
+    return _copy_result(result)
+
+
+def validate_batch(
+    cases: List[Tuple[Dict[str, Any], Optional[Dict[str, Any]]]]
+) -> List[ValidationResult]:
+    """
+    validate_for_treatment_recommendations() for many (findings, staging)
+    cases, e.g. a retrospective cohort.
+    
+    The per-case checks still walk each case's findings; scores, statuses
+    and the safety gate are then computed for the whole batch at once
+    (vectorized with numpy when it is installed).
+    """
+    if not cases:
+        return []
+    
+    # Stage 1: per-case predicates and critical lab warnings
+    present = []
+    critical = []
+    for findings, staging in cases:
+        lab_count, _, critical_warnings, _ = _scan_clinical(findings.get("clinical", []))
+        diagnosis_confirmed, pathology_present = _pathology_summary(findings)
+        present.append((
+            diagnosis_confirmed,
+            bool(findings.get("imaging")),
+            is_staging_available(findings, staging),
+            pathology_present,
+            lab_count >= 3
+        ))
+        critical.append(critical_warnings)
+    
+    # Stage 2: scores, status tiers and safety for the whole batch, from
+    # the same integer weights as the per-case score
+    if np is not None:
+        flags = np.array(present, dtype=bool)
+        points = flags.astype(np.int16) @ np.array(COMPLETENESS_WEIGHTS, dtype=np.int16)
+        totals = points / 100
+        tiers = np.searchsorted(_STATUS_THRESHOLDS, totals, side="right")
+        safe = (totals >= 0.5) & flags[:, 0] & flags[:, 3]
+        scores, tiers, safe = totals.tolist(), tiers.tolist(), safe.tolist()
+    else:
+        scores = [
+            sum(weight for ok, weight in zip(row, COMPLETENESS_WEIGHTS) if ok) / 100
+            for row in present
+        ]
+        tiers = [bisect.bisect_right(_STATUS_THRESHOLDS, score) for score in scores]
+        safe = [score >= 0.5 and row[0] and row[3] for score, row in zip(scores, present)]
+    
+    # Stage 3: assemble the results
+    results = []
+    for row, critical_warnings, score, tier, is_safe in zip(present, critical, scores, tiers, safe):
+        diagnosis_confirmed, imaging_available, staging_available, pathology_present, _ = row
+        results.append(ValidationResult(
+            is_safe_for_treatment_recs=is_safe,
+            data_completeness_score=score,
+            status=_STATUSES[tier],
+            missing_critical_data=[
+                label for ok, label in zip(row, MISSING_DATA_LABELS) if not ok
+            ],
+            warnings=_readiness_warnings(
+                critical_warnings, diagnosis_confirmed, imaging_available, staging_available, pathology_present
+            ),
+            complexity_override="high" if critical_warnings else None
+        ))
+    
+    return results
 
 
 def filter_biomarkers_by_disease(
@@ -332,18 +660,16 @@ def filter_biomarkers_by_disease(
     if disease_category == "unknown":
         return biomarkers  # Can't filter without knowing disease
     
-    relevant = DISEASE_BIOMARKER_MAP.get(disease_category, [])
-    if not relevant:
+    keep_terms = _BIOMARKER_KEEP_TERMS.get(disease_category)
+    if not keep_terms:
         return biomarkers
+    keep_names = _BIOMARKER_KEEP_NAMES[disease_category]
     
     filtered = []
     for biomarker in biomarkers:
         name = (biomarker.get("title") or biomarker.get("name") or "").upper()
-        # Check if this biomarker is relevant
-        if any(rel.upper() in name for rel in relevant):
-            filtered.append(biomarker)
-        # Also keep generic markers
-        elif any(generic in name for generic in ["LDH", "AFP", "CEA", "CA-125", "CA-19"]):
+        # Keep relevant and generic markers: exact name first, then substring
+        if name in keep_names or any(term in name for term in keep_terms):
             filtered.append(biomarker)
     
     return filtered
@@ -362,22 +688,20 @@ def sanitize_recommendations(
         return recommendations
     
     # Filter to diagnostic recommendations only
-    allowed_categories = ["diagnostic", "imaging", "biopsy", "referral", "workup", "consultation"]
-    
     filtered = []
     for rec in recommendations:
         category = (rec.get("category") or "").lower()
         text = (rec.get("text") or "").lower()
         
         # Keep diagnostic recommendations
-        if category in allowed_categories:
+        if category in DIAGNOSTIC_CATEGORIES:
             filtered.append(rec)
             continue
         
         # Check text for diagnostic intent
-        if any(term in text for term in ["confirm", "rule out", "evaluate", "assess", "test", "biopsy", "imaging", "refer"]):
-            rec_copy = dict(rec)
-            rec_copy["category"] = "diagnostic"
-            filtered.append(rec_copy)
+        if _DIAG_INTENT_RE.search(text):
+            # Recategorized copy, built in one step (category is never
+            # already "diagnostic" here: that was kept above)
+            filtered.append({**rec, "category": "diagnostic"})
     
     return filtered
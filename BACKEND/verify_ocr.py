@@ -1,11 +1,16 @@
+import asyncio
 import io
-from fastapi.testclient import TestClient
+from functools import lru_cache
+from httpx import AsyncClient, ASGITransport
 from PIL import Image, ImageDraw, ImageFont
 from main import app
 
-client = TestClient(app)
+# Copies of the report posted concurrently by test_ocr_llm_endpoint
+N_REQUESTS = 1
 
-def create_dummy_medical_image():
+@lru_cache(maxsize=1)
+def _dummy_medical_png() -> bytes:
+    """PNG bytes of the dummy report, rendered and encoded once."""
     # Create a white image
     img = Image.new('RGB', (800, 600), color='white')
     d = ImageDraw.Draw(img)
@@ -39,26 +44,39 @@ def create_dummy_medical_image():
     # Save to bytes
     img_byte_arr = io.BytesIO()
     img.save(img_byte_arr, format='PNG')
-    img_byte_arr.seek(0)
-    return img_byte_arr
+    return img_byte_arr.getvalue()
+
+def create_dummy_medical_image():
+    # Fresh stream per call over the cached PNG
+    return io.BytesIO(_dummy_medical_png())
+
+async def _post_reports(image_bytes: bytes, n: int):
+    # In-process ASGI calls, dispatched together so their handling overlaps
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        return await asyncio.gather(*[
+            ac.post(
+                "/api/ai/analyze-medical-document",
+                files={"file": ("report.png", image_bytes, "image/png")}
+            )
+            for _ in range(n)
+        ])
 
-def test_ocr_llm_endpoint():
+def test_ocr_llm_endpoint(n_requests: int = N_REQUESTS):
     print("Generating dummy medical image...")
-    image_bytes = create_dummy_medical_image()
+    image_bytes = _dummy_medical_png()
     
-    print("Sending request to /api/ai/analyze-medical-document...")
-    response = client.post(
-        "/api/ai/analyze-medical-document",
-        files={"file": ("report.png", image_bytes, "image/png")}
-    )
+    print(f"Sending {n_requests} request(s) to /api/ai/analyze-medical-document...")
+    responses = asyncio.run(_post_reports(image_bytes, n_requests))
     
-    print(f"Status Code: {response.status_code}")
-    if response.status_code == 200:
-        print("Response JSON:")
-        print(response.json())
-    else:
-        print("Error Response:")
-        print(response.text)
+    for response in responses:
+        print(f"Status Code: {response.status_code}")
+        if response.status_code == 200:
+            print("Response JSON:")
+            print(response.json())
+        else:
+            print("Error Response:")
+            print(response.text)
 
 if __name__ == "__main__":
     test_ocr_llm_endpoint()